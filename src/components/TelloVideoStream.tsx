@@ -1,4 +1,4 @@
-import React, { useState, useEffect, useRef } from 'react';
+import React, { useState, useEffect } from 'react';
 
 interface TelloVideoStreamProps {
   isStreaming: boolean;
@@ -9,52 +9,17 @@ export const TelloVideoStream: React.FC<TelloVideoStreamProps> = ({
   isStreaming,
   onStreamToggle
 }) => {
-  const [frame, setFrame] = useState<string | null>(null);
   const [error, setError] = useState<string | null>(null);
-  const intervalRef = useRef<NodeJS.Timeout | null>(null);
+  // ストリーム開始ごとにURLを変えて、ブラウザに新しい接続を張らせる
+  const [streamKey, setStreamKey] = useState(0);
 
-  // ビデオフレームを定期的に取得
+  // MJPEGストリーム（multipart/x-mixed-replace）を<img>で直接表示するため、フレームのポーリングは不要
   useEffect(() => {
     if (isStreaming) {
-      const fetchFrame = async () => {
-        try {
-          const response = await fetch('/api/video/frame');
-          const data = await response.json();
-          
-          if (data.success && data.frame) {
-            setFrame(data.frame);
-            setError(null);
-          } else {
-            setError(data.message || 'フレームの取得に失敗しました');
-          }
-        } catch (err) {
-          setError('ビデオフレームの取得中にエラーが発生しました');
-          console.error('Video frame fetch error:', err);
-        }
-      };
-
-      // 66ms間隔でフレームを取得（15 FPS）- さらなるフレームレート向上
-      intervalRef.current = setInterval(fetchFrame, 66);
-      
-      // 初回実行は少し遅らせる
-      setTimeout(fetchFrame, 200);
-      
-      // ビデオストリーミング開始時にGUIウィンドウを表示
+      setStreamKey((key) => key + 1);
       console.log('📹 ビデオストリーミングが開始されました - GUIに映像を表示します');
-    } else {
-      if (intervalRef.current) {
-        clearInterval(intervalRef.current);
-        intervalRef.current = null;
-      }
-      setFrame(null);
-      setError(null);
     }
-
-    return () => {
-      if (intervalRef.current) {
-        clearInterval(intervalRef.current);
-      }
-    };
+    setError(null);
   }, [isStreaming]);
 
   const handleStreamToggle = async () => {
@@ -106,12 +71,14 @@ export const TelloVideoStream: React.FC<TelloVideoStreamProps> = ({
           </div>
         )}
         
-        {isStreaming && frame ? (
+        {isStreaming ? (
           <div className="video-active">
             <img
-              src={`data:image/jpeg;base64,${frame}`}
+              key={streamKey}
+              src={`/api/video/stream?session=${streamKey}`}
               alt="Tello Live Stream"
               className="video-frame"
+              onError={() => setError('ビデオストリームの受信中にエラーが発生しました')}
             />
             <div className="streaming-indicator">
               <span className="live-badge">🔴 LIVE</span>
@@ -120,14 +87,7 @@ export const TelloVideoStream: React.FC<TelloVideoStreamProps> = ({
         ) : (
           <div className="no-video">
             <div className="placeholder">
-              {isStreaming ? (
-                <div className="loading-state">
-                  <p>📹 ビデオフレームを読み込み中...</p>
-                  <div className="loading-spinner"></div>
-                </div>
-              ) : (
-                <p>📷 ビデオストリーミングが停止中</p>
-              )}
+              <p>📷 ビデオストリーミングが停止中</p>
             </div>
           </div>
         )}
@@ -254,27 +214,6 @@ export const TelloVideoStream: React.FC<TelloVideoStreamProps> = ({
           font-size: 16px;
         }
         
-        .loading-state {
-          display: flex;
-          flex-direction: column;
-          align-items: center;
-          gap: 16px;
-        }
-        
-        .loading-spinner {
-          width: 32px;
-          height: 32px;
-          border: 3px solid #f3f3f3;
-          border-top: 3px solid #4CAF50;
-          border-radius: 50%;
-          animation: spin 1s linear infinite;
-        }
-        
-        @keyframes spin {
-          0% { transform: rotate(0deg); }
-          100% { transform: rotate(360deg); }
-        }
-        
         .error-message {
           position: absolute;
           top: 8px;
@@ -5,17 +5,46 @@ DJI Tello ドローン接続プログラム
 Telloドローンとの基本的な接続と制御を行います
 """
 
+import select
+import selectors
 import socket
-import threading
 import time
 import cv2
 import numpy as np
-from typing import Optional
-import queue
+from typing import Optional, Union
+
+# UDPソケットの送受信バッファサイズ（状態データのバースト時の取りこぼし防止）
+SOCKET_BUFFER_SIZE = 4 * 1024 * 1024
+
+# 成功応答（応答は前後の空白を除去済みのため完全一致で判定）
+_OK_RESPONSES = frozenset({'ok', 'OK', 'Ok', 'oK'})
+
+# コマンド名 → TelloControllerのメソッド名
+MOVE_METHODS = {
+    'up': 'move_up',
+    'down': 'move_down',
+    'left': 'move_left',
+    'right': 'move_right',
+    'forward': 'move_forward',
+    'back': 'move_back',
+}
+ROTATE_METHODS = {
+    'cw': 'rotate_clockwise',
+    'ccw': 'rotate_counter_clockwise',
+}
 
 class TelloController:
     """DJI Telloドローンを制御するクラス"""
     
+    # 固定コマンドは送信用バイト列として一度だけ用意する
+    _CMD_COMMAND = b'command'
+    _CMD_BATTERY = b'battery?'
+    _CMD_TAKEOFF = b'takeoff'
+    _CMD_LAND = b'land'
+    _CMD_EMERGENCY = b'emergency'
+    _CMD_STREAMON = b'streamon'
+    _CMD_STREAMOFF = b'streamoff'
+    
     def __init__(self):
         # Telloとの通信設定
         self.tello_ip = '192.168.10.1'
@@ -29,45 +58,50 @@ class TelloController:
         # ソケット初期化
         self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_BUFFER_SIZE)
+        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SOCKET_BUFFER_SIZE)
         self.socket.bind((self.local_ip, self.local_port))
+        self.socket.setblocking(False)  # タイムアウトはセレクターで管理
         
-        # 応答キュー
-        self.response_queue = queue.Queue()
+        # 応答受信用セレクター（受信はsend_commandのみで行う）
+        self.selector = selectors.DefaultSelector()
+        self.selector.register(self.socket, selectors.EVENT_READ)
         
-        # 応答受信用スレッド
-        self.receive_thread = threading.Thread(target=self._receive_response)
-        self.receive_thread.daemon = True
-        self.running = True
+        # 受信バッファ（データグラムごとに確保せず再利用する）
+        self._rx_buf = bytearray(2048)
+        self._rx_view = memoryview(self._rx_buf)
         
         # ビデオキャプチャ
         self.cap: Optional[cv2.VideoCapture] = None
         
         # 接続状態
         self.is_connected = False
+        self.last_battery = 0  # 最後に取得したバッテリー残量
+        # コマンドがタイムアウトした後は、電源の再投入などでSDKモードが解除された可能性があるため
+        # 次の操作の前にcommandを再送する（TelloConnectionManagerが確認する）
+        self.needs_handshake = False
         
     def connect(self) -> bool:
         """Telloに接続します"""
         try:
             print("Telloに接続中...")
             
-            # 応答受信スレッド開始
-            self.receive_thread.start()
-            
-            # 少し待機してスレッドが開始されるのを確認
-            time.sleep(0.5)
+            # 宛先を固定し、Tello以外からのデータグラムはカーネルで破棄させる
+            self.socket.connect((self.tello_ip, self.tello_port))
             
             # SDKモードを有効化（複数回試行）
             for attempt in range(3):
                 print(f"接続試行 {attempt + 1}/3")
-                response = self.send_command('command', timeout=10)
+                response = self.send_command(self._CMD_COMMAND, timeout=10)
                 
-                if 'ok' in response.lower():
+                if response in _OK_RESPONSES:
                     self.is_connected = True
+                    self.needs_handshake = False
                     print("Telloに正常に接続されました")
                     
                     # バッテリー残量を確認
-                    battery = self.get_battery()
-                    print(f"バッテリー残量: {battery}%")
+                    self.get_battery()
+                    print(f"バッテリー残量: {self.last_battery}%")
                     
                     return True
                 elif response == "timeout":
@@ -84,78 +118,70 @@ class TelloController:
             print(f"接続エラー: {e}")
             return False
     
-    def send_command(self, command: str, timeout: int = 5) -> str:
-        """コマンドをTelloに送信し、応答を受信します"""
+    def send_command(self, command: Union[bytes, str], timeout: int = 5) -> str:
+        """コマンドをTelloに送信し、応答を受信します（bytesはそのまま送信）"""
         try:
-            print(f"送信: {command}")
+            if isinstance(command, str):
+                command = command.encode('utf-8')
+            print(f"送信: {command.decode('utf-8')}")
             
-            # キューをクリア
-            while not self.response_queue.empty():
+            # 前のコマンドの遅延応答を破棄
+            while self.selector.select(0):
                 try:
-                    self.response_queue.get_nowait()
-                except queue.Empty:
+                    self.socket.recv_into(self._rx_buf)
+                except (BlockingIOError, ConnectionError):
                     break
             
-            # コマンド送信
-            self.socket.sendto(command.encode('utf-8'), (self.tello_ip, self.tello_port))
-            
-            # 応答を待機
+            # コマンド送信（送信バッファが満杯なら期限内で書き込み可能になるまで待機）
+            deadline = time.monotonic() + timeout
             try:
-                response = self.response_queue.get(timeout=timeout)
+                self.socket.send(command)
+            except BlockingIOError:
+                _, writable, _ = select.select([], [self.socket], [], timeout)
+                try:
+                    if not writable:
+                        raise BlockingIOError
+                    self.socket.send(command)
+                except BlockingIOError:
+                    print("送信バッファが空かないため送信できませんでした")
+                    return "send_blocked"
+            
+            # 応答を待機（送信から受信まで単一の期限で判定）
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self.selector.select(remaining):
+                    print("コマンドタイムアウト")
+                    self.needs_handshake = True
+                    return "timeout"
+                try:
+                    n = self.socket.recv_into(self._rx_buf)
+                except (BlockingIOError, ConnectionError):
+                    continue  # 誤通知やICMPエラー（WindowsではConnectionResetError）の場合は残り時間で再待機
+                response = self._decode_response(self._rx_view[:n])
                 print(f"応答: {response}")
                 return response
-            except queue.Empty:
-                print("コマンドタイムアウト")
-                return "timeout"
             
         except Exception as e:
             print(f"コマンド送信エラー: {e}")
             return "error"
     
-    def _receive_response(self):
-        """応答を継続的に受信するスレッド"""
-        while self.running:
-            try:
-                self.socket.settimeout(1.0)  # 1秒のタイムアウトを設定
-                response, _ = self.socket.recvfrom(1024)
-                
-                # 複数のエンコーディングを試行
-                response_str = None
-                for encoding in ['utf-8', 'ascii', 'latin-1']:
-                    try:
-                        response_str = response.decode(encoding).strip()
-                        break
-                    except UnicodeDecodeError:
-                        continue
-                
-                # すべてのエンコーディングが失敗した場合
-                if response_str is None:
-                    # バイナリデータとして処理し、印刷可能文字のみ抽出
-                    response_str = ''.join(chr(b) for b in response if 32 <= b <= 126)
-                    if not response_str:
-                        # 完全にバイナリの場合はスキップ
-                        continue
-                
-                print(f"受信: {response_str}")
-                
-                # 応答をキューに追加
-                self.response_queue.put(response_str)
-                
-            except socket.timeout:
-                # タイムアウトは正常（ループを継続）
-                continue
-            except Exception as e:
-                if self.running:  # 正常な切断でない場合のみエラー表示
-                    print(f"受信エラー: {e}")
-                break
+    def _decode_response(self, response: memoryview) -> str:
+        """受信データを文字列にデコードします（TelloのSDK応答はASCIIのみ）"""
+        data = bytes(response).strip()
+        try:
+            return data.decode('ascii')
+        except UnicodeDecodeError:
+            # ASCII以外を含む場合は印刷可能文字のみ抽出
+            return ''.join(chr(b) for b in data if 32 <= b <= 126)
     
     def get_battery(self) -> int:
         """バッテリー残量を取得します"""
-        response = self.send_command('battery?')
+        response = self.send_command(self._CMD_BATTERY)
         try:
-            return int(response)
+            self.last_battery = int(response)
         except ValueError:
-            return 0
+            self.last_battery = 0
+        return self.last_battery
     
     def takeoff(self) -> bool:
         """離陸します"""
@@ -164,86 +190,82 @@ class TelloController:
             return False
             
         print("離陸中...")
-        response = self.send_command('takeoff')
-        return 'ok' in response.lower()
+        response = self.send_command(self._CMD_TAKEOFF)
+        return response in _OK_RESPONSES
     
     def land(self) -> bool:
-        """着陸します"""
-        if not self.is_connected:
-            print("Telloに接続されていません")
-            return False
-            
+        """着陸します（安全のため接続状態に関係なく送信する）"""
         print("着陸中...")
-        response = self.send_command('land')
-        return 'ok' in response.lower()
+        response = self.send_command(self._CMD_LAND)
+        return response in _OK_RESPONSES
     
     def emergency(self) -> bool:
         """緊急停止します"""
         print("緊急停止!")
-        response = self.send_command('emergency')
-        return 'ok' in response.lower()
+        response = self.send_command(self._CMD_EMERGENCY)
+        return response in _OK_RESPONSES
     
     def move_up(self, distance: int) -> bool:
         """上昇します (20-500cm)"""
         if 20 <= distance <= 500:
-            response = self.send_command(f'up {distance}')
-            return 'ok' in response.lower()
+            response = self.send_command(b'up %d' % distance)
+            return response in _OK_RESPONSES
         return False
     
     def move_down(self, distance: int) -> bool:
         """下降します (20-500cm)"""
         if 20 <= distance <= 500:
-            response = self.send_command(f'down {distance}')
-            return 'ok' in response.lower()
+            response = self.send_command(b'down %d' % distance)
+            return response in _OK_RESPONSES
         return False
     
     def move_left(self, distance: int) -> bool:
         """左に移動します (20-500cm)"""
         if 20 <= distance <= 500:
-            response = self.send_command(f'left {distance}')
-            return 'ok' in response.lower()
+            response = self.send_command(b'left %d' % distance)
+            return response in _OK_RESPONSES
         return False
     
     def move_right(self, distance: int) -> bool:
         """右に移動します (20-500cm)"""
         if 20 <= distance <= 500:
-            response = self.send_command(f'right {distance}')
-            return 'ok' in response.lower()
+            response = self.send_command(b'right %d' % distance)
+            return response in _OK_RESPONSES
         return False
     
     def move_forward(self, distance: int) -> bool:
         """前進します (20-500cm)"""
         if 20 <= distance <= 500:
-            response = self.send_command(f'forward {distance}')
-            return 'ok' in response.lower()
+            response = self.send_command(b'forward %d' % distance)
+            return response in _OK_RESPONSES
         return False
     
     def move_back(self, distance: int) -> bool:
         """後退します (20-500cm)"""
         if 20 <= distance <= 500:
-            response = self.send_command(f'back {distance}')
-            return 'ok' in response.lower()
+            response = self.send_command(b'back %d' % distance)
+            return response in _OK_RESPONSES
         return False
     
     def rotate_clockwise(self, degrees: int) -> bool:
         """時計回りに回転します (1-360度)"""
         if 1 <= degrees <= 360:
-            response = self.send_command(f'cw {degrees}')
-            return 'ok' in response.lower()
+            response = self.send_command(b'cw %d' % degrees)
+            return response in _OK_RESPONSES
         return False
     
     def rotate_counter_clockwise(self, degrees: int) -> bool:
         """反時計回りに回転します (1-360度)"""
         if 1 <= degrees <= 360:
-            response = self.send_command(f'ccw {degrees}')
-            return 'ok' in response.lower()
+            response = self.send_command(b'ccw %d' % degrees)
+            return response in _OK_RESPONSES
         return False
     
     def start_video_stream(self) -> bool:
         """ビデオストリームを開始します"""
         try:
-            response = self.send_command('streamon')
-            if 'ok' in response.lower():
+            response = self.send_command(self._CMD_STREAMON)
+            if response in _OK_RESPONSES:
                 # OpenCVでビデオキャプチャを初期化
                 self.cap = cv2.VideoCapture(f'udp://@0.0.0.0:{self.video_port}')
                 print("ビデオストリーム開始")
@@ -259,9 +281,9 @@ class TelloController:
             if self.cap:
                 self.cap.release()
                 self.cap = None
-            response = self.send_command('streamoff')
+            response = self.send_command(self._CMD_STREAMOFF)
             print("ビデオストリーム停止")
-            return 'ok' in response.lower()
+            return response in _OK_RESPONSES
         except Exception as e:
             print(f"ビデオストリーム停止エラー: {e}")
             return False
@@ -277,15 +299,10 @@ class TelloController:
     def disconnect(self):
         """Telloから切断します"""
         try:
-            self.running = False  # 受信スレッドを停止
-            
             if self.cap:
                 self.stop_video_stream()
             
-            # スレッドの終了を待機
-            if self.receive_thread.is_alive():
-                self.receive_thread.join(timeout=2)
-            
+            self.selector.close()
             self.socket.close()
             self.is_connected = False
             print("Telloから切断されました")
@@ -302,8 +319,8 @@ def main():
         if not tello.connect():
             return
         
-        # 基本情報を取得
-        print(f"🔋 バッテリー: {tello.get_battery()}%")
+        # 基本情報を表示（接続時に取得済みの値を使用）
+        print(f"🔋 バッテリー: {tello.last_battery}%")
         
         # ユーザー入力待ち
         print("\n=== Tello制御コマンド ===")
@@ -338,37 +355,26 @@ def main():
                                 break
                     cv2.destroyAllWindows()
                     tello.stop_video_stream()
-            elif command.startswith(('up', 'down', 'left', 'right', 'forward', 'back')):
+            elif command.startswith(tuple(MOVE_METHODS)):
                 parts = command.split()
                 if len(parts) == 2:
                     try:
                         distance = int(parts[1])
-                        direction = parts[0]
-                        if direction == 'up':
-                            tello.move_up(distance)
-                        elif direction == 'down':
-                            tello.move_down(distance)
-                        elif direction == 'left':
-                            tello.move_left(distance)
-                        elif direction == 'right':
-                            tello.move_right(distance)
-                        elif direction == 'forward':
-                            tello.move_forward(distance)
-                        elif direction == 'back':
-                            tello.move_back(distance)
+                        method_name = MOVE_METHODS.get(parts[0])
+                        if method_name:
+                            getattr(tello, method_name)(distance)
                     except ValueError:
                         print("距離は数値で入力してください")
                 else:
                     print("使用法: [方向] [距離(cm)]")
-            elif command.startswith(('cw', 'ccw')):
+            elif command.startswith(tuple(ROTATE_METHODS)):
                 parts = command.split()
                 if len(parts) == 2:
                     try:
                         degrees = int(parts[1])
-                        if parts[0] == 'cw':
-                            tello.rotate_clockwise(degrees)
-                        else:
-                            tello.rotate_counter_clockwise(degrees)
+                        method_name = ROTATE_METHODS.get(parts[0])
+                        if method_name:
+                            getattr(tello, method_name)(degrees)
                     except ValueError:
                         print("角度は数値で入力してください")
                 else:
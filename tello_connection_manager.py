@@ -11,7 +11,52 @@ import argparse
 import atexit
 import signal
 import os
-from tello_connection import TelloController
+import socket
+import subprocess
+import time
+from typing import TYPE_CHECKING, Optional
+
+# tello_connection（OpenCV/NumPy）の読み込みは実際にTelloを操作するプロセスでのみ行う
+# （デーモン経由のCLI呼び出しではimport時間を省く）
+if TYPE_CHECKING:
+    from tello_connection import TelloController
+
+try:
+    import orjson
+except ImportError:  # orjsonが無い環境では標準のjsonを使用
+    orjson = None
+
+# 常駐デーモン設定（CLI呼び出し間でTello接続を維持する）
+# AF_UNIXが使える環境では所有者のみアクセスできるUNIXドメインソケットで待ち受ける。
+# 使えない環境（Windows版Python）では127.0.0.1のTCPにフォールバックするが、
+# TCPには認証が無く、同じPCの他ユーザーからもドローンを操作できる点に注意。
+DAEMON_SOCKET_PATH = os.path.join(os.path.expanduser('~'), '.tello_daemon.sock')
+DAEMON_USE_UNIX_SOCKET = hasattr(socket, 'AF_UNIX')
+DAEMON_HOST = '127.0.0.1'
+DAEMON_PORT = 8891
+DAEMON_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tello_daemon.py')
+DAEMON_CONNECT_TIMEOUT = 1.0
+DAEMON_STARTUP_TIMEOUT = 5.0
+DAEMON_REQUEST_TIMEOUT = 120.0
+# この秒数だけ要求が無ければデーモンは切断して終了する（UDPポートとSDKセッションを手放す）
+DAEMON_IDLE_TIMEOUT = 600.0
+
+# 再接続（commandの再送）に失敗しても送信する安全のためのコマンド
+_SAFETY_COMMANDS = frozenset(('land', 'emergency'))
+
+def dumps_json(obj) -> bytes:
+    """結果をUTF-8のJSONバイト列に変換する"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False).encode('utf-8')
+
+
+def _write_result(data: bytes):
+    """JSONバイト列を1行として標準出力に書き出す"""
+    sys.stdout.flush()
+    sys.stdout.buffer.write(data + b'\n')
+    sys.stdout.buffer.flush()
+
 
 class TelloConnectionManager:
     """Tello接続を管理するシングルトンクラス"""
@@ -40,9 +85,10 @@ class TelloConnectionManager:
         self.cleanup()
         sys.exit(0)
     
-    def get_controller(self) -> TelloController:
+    def get_controller(self) -> 'TelloController':
         """Telloコントローラーを取得（必要に応じて接続）"""
         if self._tello_controller is None:
+            from tello_connection import TelloController
             self._tello_controller = TelloController()
         return self._tello_controller
     
@@ -51,7 +97,7 @@ class TelloConnectionManager:
         try:
             controller = self.get_controller()
             
-            if controller.is_connected:
+            if controller.is_connected and not controller.needs_handshake:
                 battery = controller.get_battery()
                 return {
                     "success": True,
@@ -64,12 +110,12 @@ class TelloConnectionManager:
             
             success = controller.connect()
             if success:
-                battery = controller.get_battery()
+                # 接続処理内で取得済みのバッテリー残量を使用
                 return {
                     "success": True,
                     "message": "接続成功",
                     "data": {
-                        "battery": battery,
+                        "battery": controller.last_battery,
                         "connected": True
                     }
                 }
@@ -95,6 +141,8 @@ class TelloConnectionManager:
         try:
             if self._tello_controller and self._tello_controller.is_connected:
                 self._tello_controller.disconnect()
+                # 切断したコントローラーは再利用できないため破棄する
+                self._tello_controller = None
                 return {
                     "success": True,
                     "message": "切断成功",
@@ -155,19 +203,24 @@ class TelloConnectionManager:
     
     def execute_command(self, command: str, **kwargs) -> dict:
         """Telloコマンドを実行"""
+        from tello_connection import MOVE_METHODS, ROTATE_METHODS
+        
         try:
             controller = self.get_controller()
             
-            # 接続確認
-            if not controller.is_connected:
+            # 接続確認（前回のコマンドがタイムアウトしていればcommandを再送してSDKモードを確実にする）
+            just_connected = False
+            if not controller.is_connected or controller.needs_handshake:
                 connect_result = self.connect()
-                if not connect_result["success"]:
+                if connect_result["success"]:
+                    just_connected = True
+                elif command not in _SAFETY_COMMANDS:
                     return connect_result
             
             # コマンド実行
             if command == 'takeoff':
-                # バッテリーチェック
-                battery = controller.get_battery()
+                # バッテリーチェック（接続直後は接続時に取得した値を使用）
+                battery = controller.last_battery if just_connected else controller.get_battery()
                 if battery < 20:
                     return {
                         "success": False,
@@ -195,7 +248,7 @@ class TelloConnectionManager:
                     "message": "緊急停止実行" if success else "緊急停止失敗"
                 }
             
-            elif command in ['up', 'down', 'left', 'right', 'forward', 'back']:
+            elif command in MOVE_METHODS:
                 distance = kwargs.get('distance')
                 if not distance or not (20 <= distance <= 500):
                     return {
@@ -203,22 +256,13 @@ class TelloConnectionManager:
                         "message": "距離は20-500cmの範囲で指定してください"
                     }
                 
-                method_map = {
-                    'up': controller.move_up,
-                    'down': controller.move_down,
-                    'left': controller.move_left,
-                    'right': controller.move_right,
-                    'forward': controller.move_forward,
-                    'back': controller.move_back
-                }
-                
-                success = method_map[command](distance)
+                success = getattr(controller, MOVE_METHODS[command])(distance)
                 return {
                     "success": success,
                     "message": f"{command} {distance}cm {'成功' if success else '失敗'}"
                 }
             
-            elif command in ['cw', 'ccw']:
+            elif command in ROTATE_METHODS:
                 degrees = kwargs.get('degrees')
                 if not degrees or not (1 <= degrees <= 360):
                     return {
@@ -226,10 +270,7 @@ class TelloConnectionManager:
                         "message": "角度は1-360度の範囲で指定してください"
                     }
                 
-                if command == 'cw':
-                    success = controller.rotate_clockwise(degrees)
-                else:
-                    success = controller.rotate_counter_clockwise(degrees)
+                success = getattr(controller, ROTATE_METHODS[command])(degrees)
                 
                 return {
                     "success": success,
@@ -257,50 +298,168 @@ class TelloConnectionManager:
                 pass
 
 
+def _run_execute(manager: TelloConnectionManager, request: dict) -> dict:
+    """executeアクションを実行する"""
+    command = request.get('command')
+    if not command:
+        return {
+            "success": False,
+            "message": "executeアクションにはcommandパラメータが必要です"
+        }
+    
+    kwargs = {}
+    if request.get('distance') is not None:
+        kwargs['distance'] = request['distance']
+    if request.get('degrees') is not None:
+        kwargs['degrees'] = request['degrees']
+    
+    return manager.execute_command(command, **kwargs)
+
+
+# アクション名 → 処理関数
+_ACTION_HANDLERS = {
+    'connect': lambda manager, request: manager.connect(),
+    'disconnect': lambda manager, request: manager.disconnect(),
+    'status': lambda manager, request: manager.get_status(),
+    'execute': _run_execute,
+}
+
+
+def run_action(manager: TelloConnectionManager, request: dict) -> dict:
+    """アクション要求を実行して結果を返す（CLI・常駐デーモン共通）"""
+    action = request.get('action')
+    handler = _ACTION_HANDLERS.get(action)
+    if handler is None:
+        return {
+            "success": False,
+            "message": f"不明なアクション: {action}"
+        }
+    
+    try:
+        return handler(manager, request)
+    except Exception as e:
+        return {
+            "success": False,
+            "message": f"エラー: {str(e)}"
+        }
+
+
+# デーモンが起動していないことを示す接続エラー（WindowsではlocalhostへのTCP接続拒否がタイムアウトになる場合がある）
+_DAEMON_NOT_RUNNING_ERRORS = (ConnectionRefusedError, FileNotFoundError, socket.timeout)
+
+
+def _connect_daemon() -> socket.socket:
+    """常駐デーモンに接続する"""
+    if not DAEMON_USE_UNIX_SOCKET:
+        return socket.create_connection((DAEMON_HOST, DAEMON_PORT), timeout=DAEMON_CONNECT_TIMEOUT)
+    
+    conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        conn.settimeout(DAEMON_CONNECT_TIMEOUT)
+        conn.connect(DAEMON_SOCKET_PATH)
+    except BaseException:
+        conn.close()
+        raise
+    return conn
+
+
+def _spawn_daemon():
+    """常駐デーモンをバックグラウンドで起動する"""
+    kwargs = {}
+    if os.name == 'nt':
+        kwargs['creationflags'] = subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+    else:
+        kwargs['start_new_session'] = True
+    
+    subprocess.Popen(
+        [sys.executable, DAEMON_SCRIPT],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        close_fds=True,
+        **kwargs
+    )
+
+
+def request_daemon(request: dict) -> Optional[bytes]:
+    """常駐デーモンに要求を送り、JSON1行の応答を返す（デーモンに接続できない場合はNone）"""
+    try:
+        conn = _connect_daemon()
+    except _DAEMON_NOT_RUNNING_ERRORS:
+        if request.get('action') == 'shutdown':
+            return None
+        
+        # デーモン未起動の場合のみ起動して接続を待つ
+        _spawn_daemon()
+        deadline = time.monotonic() + DAEMON_STARTUP_TIMEOUT
+        while True:
+            time.sleep(0.1)
+            try:
+                conn = _connect_daemon()
+                break
+            except _DAEMON_NOT_RUNNING_ERRORS:
+                if time.monotonic() >= deadline:
+                    return None
+    except OSError:
+        return None
+    
+    with conn:
+        conn.settimeout(DAEMON_REQUEST_TIMEOUT)
+        conn.sendall(dumps_json(request) + b'\n')
+        with conn.makefile('rb') as reader:
+            response = reader.readline().rstrip(b'\n')
+    
+    # 応答行を返さずに切断された（デーモンの要求処理のタイムアウトや異常終了）
+    if not response:
+        return dumps_json({
+            "success": False,
+            "message": "デーモンが応答せずに接続を閉じました"
+        })
+    return response
+
+
 def main():
     """メイン関数"""
     parser = argparse.ArgumentParser(description='Tello Connection Manager')
-    parser.add_argument('action', choices=['connect', 'disconnect', 'status', 'execute'], 
+    parser.add_argument('action', choices=[*_ACTION_HANDLERS, 'shutdown'], 
                        help='実行するアクション')
     parser.add_argument('--command', help='実行するコマンド（executeアクション用）')
     parser.add_argument('--distance', type=int, help='移動距離（cm）')
     parser.add_argument('--degrees', type=int, help='回転角度（度）')
+    parser.add_argument('--no-daemon', action='store_true',
+                       help='常駐デーモンを使わずにこのプロセス内で実行する')
     
     args = parser.parse_args()
     
-    manager = TelloConnectionManager()
-    result = {}
+    request = {
+        "action": args.action,
+        "command": args.command,
+        "distance": args.distance,
+        "degrees": args.degrees
+    }
     
-    try:
-        if args.action == 'connect':
-            result = manager.connect()
-        elif args.action == 'disconnect':
-            result = manager.disconnect()
-        elif args.action == 'status':
-            result = manager.get_status()
-        elif args.action == 'execute':
-            if not args.command:
-                result = {
-                    "success": False,
-                    "message": "executeアクションにはcommandパラメータが必要です"
-                }
-            else:
-                kwargs = {}
-                if args.distance is not None:
-                    kwargs['distance'] = args.distance
-                if args.degrees is not None:
-                    kwargs['degrees'] = args.degrees
-                
-                result = manager.execute_command(args.command, **kwargs)
+    # 常駐デーモン経由で実行（UDPソケットとSDKセッションを呼び出し間で維持）
+    if not args.no_daemon:
+        try:
+            response = request_daemon(request)
+        except OSError as e:
+            response = dumps_json({
+                "success": False,
+                "message": f"デーモン通信エラー: {str(e)}"
+            })
         
-    except Exception as e:
-        result = {
-            "success": False,
-            "message": f"エラー: {str(e)}"
-        }
+        if response is not None:
+            _write_result(response)
+            return
+    
+    # デーモンを利用できない場合はこのプロセス内で実行
+    if args.action == 'shutdown':
+        result = {"success": True, "message": "デーモンは起動していません"}
+    else:
+        result = run_action(TelloConnectionManager(), request)
     
     # JSON形式で結果を出力
-    print(json.dumps(result, ensure_ascii=False))
+    _write_result(dumps_json(result))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+DJI Tello 常駐デーモン
+TelloConnectionManagerを常駐させ、CLI呼び出し間でUDPソケットとSDKセッションを維持します
+
+tello_connection_manager.py から自動的に起動されます。
+要求・応答はどちらも1行のJSONです。
+一定時間（DAEMON_IDLE_TIMEOUT）要求が無ければTelloから切断して終了します。
+
+待ち受けにはAF_UNIXが使える環境では所有者のみアクセスできるUNIXドメインソケット
+（DAEMON_SOCKET_PATH）を使用します。Windows版Pythonなど使えない環境では
+127.0.0.1:DAEMON_PORT のTCPで待ち受けますが、認証が無いため同じPCの他ユーザーからも
+接続できます。
+"""
+
+import json
+import os
+import socket
+import socketserver
+from tello_connection_manager import (
+    DAEMON_HOST,
+    DAEMON_IDLE_TIMEOUT,
+    DAEMON_PORT,
+    DAEMON_SOCKET_PATH,
+    DAEMON_USE_UNIX_SOCKET,
+    TelloConnectionManager,
+    dumps_json,
+    run_action,
+)
+
+
+class TelloDaemonHandler(socketserver.StreamRequestHandler):
+    """1接続につき1要求を処理するハンドラー"""
+    
+    # 応答しないクライアントでデーモンが止まらないようにする
+    timeout = 5.0
+    
+    def handle(self):
+        line = self.rfile.readline()
+        if not line:
+            return
+        
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            result = {
+                "success": False,
+                "message": f"無効な要求です: {str(e)}"
+            }
+        else:
+            if request.get('action') == 'shutdown':
+                result = self.server.manager.disconnect()
+                result["message"] = "デーモンを停止しました"
+                self.server.shutdown_requested = True
+            else:
+                result = run_action(self.server.manager, request)
+        
+        self.wfile.write(dumps_json(result) + b'\n')
+        self.wfile.flush()
+        
+        # クライアント側から先に切断させ、TIME_WAITをデーモンのポートに残さない
+        # （切断しないクライアントはタイムアウトで打ち切る）
+        try:
+            self.rfile.read(1)
+        except OSError:
+            pass
+
+
+class TelloDaemonServer(socketserver.UnixStreamServer if DAEMON_USE_UNIX_SOCKET else socketserver.TCPServer):
+    """Tello接続を保持する常駐サーバー（要求は1件ずつ直列に処理）"""
+    
+    # 再起動直後のTIME_WAITでバインドに失敗しないようにする（TCPフォールバック時のみ有効）
+    # （WindowsのSO_REUSEADDRは使用中ポートの重複バインドを許すため設定しない）
+    allow_reuse_address = os.name != 'nt'
+    
+    # 一定時間要求が無ければhandle_requestがhandle_timeoutを呼ぶ
+    timeout = DAEMON_IDLE_TIMEOUT
+    
+    def __init__(self):
+        if DAEMON_USE_UNIX_SOCKET:
+            _remove_stale_socket()
+            # ソケットファイルを作成時点から所有者のみ読み書きできるようにする
+            old_umask = os.umask(0o177)
+            try:
+                super().__init__(DAEMON_SOCKET_PATH, TelloDaemonHandler)
+            finally:
+                os.umask(old_umask)
+            self._owns_socket_file = True
+        else:
+            super().__init__((DAEMON_HOST, DAEMON_PORT), TelloDaemonHandler)
+        self.manager = TelloConnectionManager()
+        self.shutdown_requested = False
+    
+    # バインドに失敗した場合に他のデーモンのソケットファイルを削除しないための印
+    _owns_socket_file = False
+    
+    def server_close(self):
+        super().server_close()
+        if self._owns_socket_file:
+            try:
+                os.unlink(DAEMON_SOCKET_PATH)
+            except FileNotFoundError:
+                pass
+    
+    def handle_timeout(self):
+        """アイドル状態が続いたら切断して終了する（後から起動したWebサーバーなどにUDPポートを譲る）"""
+        self.manager.disconnect()
+        self.shutdown_requested = True
+
+
+def _remove_stale_socket():
+    """異常終了したデーモンが残したソケットファイルを削除する（稼働中のデーモンがあればOSError）"""
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(DAEMON_SOCKET_PATH)
+    except FileNotFoundError:
+        return
+    except ConnectionRefusedError:
+        os.unlink(DAEMON_SOCKET_PATH)
+        return
+    finally:
+        probe.close()
+    raise OSError(f"デーモンは既に起動しています: {DAEMON_SOCKET_PATH}")
+
+
+def main():
+    """メイン関数"""
+    with TelloDaemonServer() as server:
+        try:
+            while not server.shutdown_requested:
+                server.handle_request()
+        finally:
+            server.manager.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -13,26 +13,248 @@ Mastra AIエージェントからHTTP APIでTelloを制御するためのサー
 """
 
 import asyncio
+import collections
+import functools
 import json
 import logging
-from aiohttp import web
+import os
+import random
+import re
+import selectors
+from aiohttp import hdrs, web
+from multidict import CIMultiDict
 from typing import Dict, Any, Optional, Tuple
 import socket
 import threading
 import cv2
-from datetime import datetime
-import contextlib
 import base64
 import time
 import subprocess
 import numpy as np
 
+try:
+    import fcntl
+except ImportError:  # Windowsにはfcntlが無い
+    fcntl = None
+
+try:
+    import orjson
+except ImportError:  # orjsonが無い環境では標準のjsonを使用
+    orjson = None
+
+try:
+    import av
+except ImportError:  # PyAVが無い環境ではOpenCV/FFmpegでのキャプチャのみ使用
+    av = None
+
+try:
+    from turbojpeg import TurboJPEG
+    _turbo_jpeg = TurboJPEG()
+except (ImportError, OSError, RuntimeError):  # libjpeg-turboが無い環境ではcv2.imencodeを使用
+    _turbo_jpeg = None
+
 # ログ設定 - INFOレベル以上を出力（重要な情報のみ）
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-# WebサーバーのHTTPアクセスログを無効化
-logging.getLogger('aiohttp.access').setLevel(logging.WARNING)
+# UDPソケットの送受信バッファサイズ（状態データやキーフレームのバースト時の取りこぼし防止）
+SOCKET_BUFFER_SIZE = 4 * 1024 * 1024
+
+# 受信データ判定用テーブル（印刷可能文字と応答末尾の改行などの空白→0、それ以外→1）
+_NON_PRINTABLE_TABLE = bytes(0 if 32 <= i <= 126 or i in (9, 10, 13) else 1 for i in range(256))
+
+# 既知のTelloレスポンス（完全一致する大半の応答はここで判定される）
+_KNOWN_RESPONSES = frozenset({b'ok', b'error', b'timeout', b'out of range', b'false', b'true'})
+
+# Tello応答の判定パターン（既知の応答を含む、数値、または50文字以下の文字列）
+_VALID_RESPONSE_RE = re.compile(
+    rb'ok|error|timeout|out of range|false|true'
+    rb'|^[-+]?\d+(?:\.\d*)?\Z'
+    rb'|^.{1,50}\Z',
+    re.IGNORECASE | re.DOTALL,
+)
+
+# 移動・回転コマンドで受け付ける方向
+MOVE_DIRECTIONS = frozenset(('up', 'down', 'left', 'right', 'forward', 'back'))
+ROTATE_DIRECTIONS = frozenset(('cw', 'ccw'))
+
+# UDPのH.264ストリームを開く際のFFmpegオプション（入力バッファリングと並べ替え待ちを無効化）
+FFMPEG_LOW_DELAY_OPTIONS = {
+    'fflags': 'nobuffer',
+    'flags': 'low_delay',
+    'probesize': '32',
+    'analyzeduration': '0',
+    'max_delay': '0',
+}
+
+# OpenCVのFFmpegバックエンドにはバッファリング無効化のオプションのみ渡す。環境変数はプロセス全体の
+# VideoCaptureで参照されるため、ストリーム解析を打ち切るprobesize/analyzedurationは含めない
+# （環境変数で明示的に指定されていればそちらを優先）
+os.environ.setdefault('OPENCV_FFMPEG_CAPTURE_OPTIONS', 'fflags;nobuffer|flags;low_delay')
+
+# FFmpegの出力パイプのカーネルバッファサイズ（1フレーム分が一度に収まるようにする）
+FFMPEG_PIPE_SIZE = 1024 * 1024
+
+# ビデオフレームのJPEG品質（画質を抑えて転送量とエンコード時間を削減）
+JPEG_QUALITY = 60
+# Web配信時の最大フレームサイズ（幅, 高さ）。これより大きいフレームは縦横比を保って縮小してからエンコード
+VIDEO_WEB_SIZE = (480, 360)
+# MJPEGストリームで新しいフレームを確認する間隔（秒、30fps相当）
+MJPEG_POLL_INTERVAL = 1 / 30
+# PyAVスレッドの終了を待つ最大秒数（av.openの読み取りタイムアウト3秒より長くする）
+PYAV_JOIN_TIMEOUT = 5.0
+
+# 固定メッセージの共通レスポンス（HTTPレスポンスのボディは起動時に一度だけ生成）
+_NOT_CONNECTED_RESULT = {"success": False, "message": "Telloに接続されていません"}
+_NOT_FLYING_RESULT = {"success": False, "message": "飛行中ではありません"}
+_INVALID_DISTANCE_RESULT = {"success": False, "message": "距離は20-500cmの範囲で指定してください"}
+_INVALID_DEGREES_RESULT = {"success": False, "message": "角度は1-360度の範囲で指定してください"}
+_VIDEO_NOT_STARTED_RESULT = {"success": False, "message": "ビデオストリーミングが開始されていません"}
+_DISCONNECTED_RESULT = {"success": True, "message": "切断しました"}
+
+# 成功応答（応答は前後の空白を除去済みのため完全一致で判定）
+_OK_RESPONSES = frozenset({'ok', 'OK', 'Ok', 'oK'})
+
+# 自動着陸時に返す推奨対応
+_AUTO_LAND_RECOMMENDATIONS = (
+    "バッテリー残量を確認してください（推奨: 30%以上）",
+    "ドローンとの距離が遠すぎないか確認してください",
+    "周囲に障害物がないか確認してください",
+    "再度離陸する前に少し待機してください",
+)
+
+# 送信待ちを含めて同時に受け付けるコマンド数の上限（超過分は"busy"で即時拒否）
+MAX_QUEUED_COMMANDS = 4
+# 上限に達していても拒否しない安全のためのコマンド（緊急停止・着陸）
+_UNSHEDDABLE_COMMANDS = frozenset(('emergency', 'land'))
+
+# 移動・回転コマンド1回あたりの応答待ち時間（秒）
+FLIGHT_COMMAND_TIMEOUT = 10.0
+# 移動・回転コマンドの再接続・再試行を含めた全体の期限（秒、初回と再試行の2回分に再接続の確認を加えた長さ）
+FLIGHT_COMMAND_DEADLINE = 25.0
+
+# バッテリー残量のキャッシュ有効期間（秒、この間はbattery?を送信しない）
+BATTERY_CACHE_TTL = 2.0
+
+# 再試行の待機時間（Full jitter方式の指数バックオフ、秒）
+RETRY_BACKOFF_BASE = 0.5
+RETRY_BACKOFF_CAP = 4.0
+
+# 秒単位でキャッシュしたISO形式のタイムスタンプ（レスポンスごとの整形を省く）
+_timestamp_cache = (-1, '')
+
+
+def _now_iso() -> str:
+    """現在時刻のISO形式文字列を返します（同一秒内はキャッシュを再利用）"""
+    global _timestamp_cache
+    second = int(time.time())
+    if second != _timestamp_cache[0]:
+        _timestamp_cache = (second, time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(second)))
+    return _timestamp_cache[1]
+
+
+@functools.lru_cache(maxsize=256)
+def _classify_datagram(data: bytes) -> Optional[str]:
+    """受信データグラムをTelloの応答文字列に変換します（無効なデータはNone）
+    
+    Telloの応答の種類は少ないため、判定結果は受信データごとにキャッシュする。
+    """
+    # 印刷可能文字が70%未満ならバイナリ（制御文字も含め非印刷文字の数をCレベルで集計）
+    if data.translate(_NON_PRINTABLE_TABLE).count(b'\x01') * 10 > len(data) * 3:
+        return None
+    
+    # 判定はバイト列のまま行い、有効な応答のみデコードする（TelloのSDK応答はASCIIのみ）
+    stripped = data.strip()
+    if stripped not in _KNOWN_RESPONSES and _VALID_RESPONSE_RE.search(stripped) is None:
+        return None
+    try:
+        return stripped.decode('ascii')
+    except UnicodeDecodeError:
+        return None
+
+
+def _auto_land_response(response: str, battery: int, flight_status: str) -> Dict[str, Any]:
+    """自動着陸が発生した場合のレスポンスを作成します"""
+    return {
+        "success": False,
+        "message": f"ドローンが自動着陸しました。原因: {response}",
+        "details": {
+            "reason": "auto_land",
+            "battery": battery,
+            "flight_status": flight_status,
+            "recommendations": _AUTO_LAND_RECOMMENDATIONS
+        },
+        "raw_response": response,
+        "timestamp": _now_iso()
+    }
+
+
+def _expire_future(future: asyncio.Future):
+    """応答待ちのFutureをタイムアウトさせます（loop.call_laterから呼び出し）"""
+    if not future.done():
+        future.set_exception(asyncio.TimeoutError())
+
+
+def _enlarge_pipe(pipe) -> None:
+    """パイプのカーネルバッファを拡張し、1フレームあたりの読み書き回数を減らします（Linuxのみ）"""
+    set_pipe_size = getattr(fcntl, 'F_SETPIPE_SZ', None)
+    if set_pipe_size is None:
+        return
+    try:
+        fcntl.fcntl(pipe.fileno(), set_pipe_size, FFMPEG_PIPE_SIZE)
+    except OSError as e:
+        # pipe-max-sizeを超える場合など。既定のサイズのまま続行する
+        logger.debug("パイプバッファを拡張できませんでした: %s", e)
+
+
+def _open_video_capture(url: str) -> cv2.VideoCapture:
+    """FFmpegバックエンドでビデオキャプチャを開きます
+    
+    ハードウェアデコードはオープン時にのみ指定でき、使えない環境ではソフトウェアデコードになります。
+    """
+    return cv2.VideoCapture(url, cv2.CAP_FFMPEG,
+                            [cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY])
+
+
+def _downscale_for_web(frame: np.ndarray) -> np.ndarray:
+    """Web配信用にフレームをVIDEO_WEB_SIZEに収まるよう縦横比を保って縮小します
+
+    latest_frame自体は元の解像度のまま（拡大はしない）。
+    """
+    frame_height, frame_width = frame.shape[:2]
+    scale = min(VIDEO_WEB_SIZE[0] / frame_width, VIDEO_WEB_SIZE[1] / frame_height)
+    if scale >= 1:
+        return frame
+    size = (max(1, round(frame_width * scale)), max(1, round(frame_height * scale)))
+    return cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+
+
+def _encode_jpeg(frame: np.ndarray) -> bytes:
+    """BGRフレームをJPEGにエンコードします（libjpeg-turboがあれば使用）"""
+    if _turbo_jpeg is not None:
+        return _turbo_jpeg.encode(frame, quality=JPEG_QUALITY)
+    _, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, JPEG_QUALITY])
+    return buffer.tobytes()
+
+
+def _backoff_delay(attempt: int) -> float:
+    """attempt回目の再試行前に待機する時間を返します（0〜上限の一様乱数）"""
+    return random.uniform(0, min(RETRY_BACKOFF_CAP, RETRY_BACKOFF_BASE * 2 ** attempt))
+
+
+class TelloProtocol(asyncio.DatagramProtocol):
+    """Telloの応答をイベントループ上で直接受信するプロトコル"""
+    
+    def __init__(self, controller: 'AsyncTelloController'):
+        self.controller = controller
+    
+    def datagram_received(self, data: bytes, addr):
+        self.controller._handle_datagram(data)
+    
+    def error_received(self, exc: Exception):
+        # 接続済みUDPソケットではICMP到達不能がConnectionRefusedErrorとして通知される
+        logger.debug("UDP受信エラー: %s", exc)
+
 
 class AsyncTelloController:
     """非同期対応のDJI Telloドローン制御クラス"""
@@ -47,14 +269,15 @@ class AsyncTelloController:
         # ビデオストリーム設定
         self.video_port = 11111
         
-        # ソケット初期化
-        self.socket = None
-        self.response_queue = None  # asyncio.Queueに変更
-        self.receive_thread = None
-        self.running = False
+        # UDPトランスポート（応答はTelloProtocolがイベントループ上で受信）
+        self.transport: Optional[asyncio.DatagramTransport] = None
+        self._awaiting: Optional[asyncio.Future] = None  # 応答待ちのFuture（同時に1つのみ）
         
-        # コマンド実行の直列化用ロック
+        # コマンド実行の直列化用ロックと待機中のコマンド数
         self.command_lock = asyncio.Lock()
+        self._queued_commands = 0
+        # 実行中の問い合わせコマンド（同じ問い合わせが重なった場合は結果を共有）
+        self._inflight_queries: Dict[str, asyncio.Task] = {}
         
         # イベントループの参照を保持
         self.loop = None
@@ -62,24 +285,36 @@ class AsyncTelloController:
         # ビデオキャプチャ
         self.cap: Optional[cv2.VideoCapture] = None
         self.video_streaming = False
+        # 最新フレーム（キャプチャスレッドは新しい配列を代入するだけで、公開済みのフレームを
+        # 書き換えないため、参照の受け渡しのみでロックやコピーは不要）
         self.latest_frame = None
-        self.frame_lock = threading.Lock()
+        # 直近にエンコードしたフレームとそのJPEG・Base64文字列（同一フレームの再エンコードを省く）
+        self._encoded_frame: Tuple[Optional[np.ndarray], bytes, str] = (None, b"", "")
+        # 直近にWeb配信用に縮小してエンコードしたフレームとそのJPEG
+        self._encoded_web_frame: Tuple[Optional[np.ndarray], bytes] = (None, b"")
         
         # FFmpegプロセス（代替ビデオ処理用）
         self.ffmpeg_process = None
         self.use_ffmpeg = False
         
+        # PyAVキャプチャ用（コンテナはキャプチャスレッドが所有し、終了時に閉じる）
+        self.use_pyav = False
+        self._pyav_thread: Optional[threading.Thread] = None
+        
         # シンプルUDPキャプチャ用
         self.udp_socket = None
+        # 受信待ちのビデオUDPスレッドを停止時に即座に起こすためのソケットペア（読み側, 書き側）
+        self._udp_wakeup: Optional[Tuple[socket.socket, socket.socket]] = None
         self.use_simple_udp = False
         
         # 接続状態
         self.is_connected = False
         self.last_battery = 0
+        self._battery_read_at = 0.0  # last_batteryを取得した時刻（time.monotonic）
         self.flight_status = "landed"  # landed, flying, emergency
         
-        # 操作ログ
-        self.operation_log = []
+        # 操作ログ（最新100件を (UNIX時刻, 操作名, 詳細) のタプルで保持）
+        self.operation_log = collections.deque(maxlen=100)
     
     async def connect(self) -> Dict[str, Any]:
         """Telloに接続します"""
@@ -89,45 +324,29 @@ class AsyncTelloController:
             # 現在のイベントループを保存
             self.loop = asyncio.get_running_loop()
             
-            # asyncio.Queueを初期化
-            self.response_queue = asyncio.Queue()
-            
             # ソケット初期化
-            self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
             try:
-                self.socket.bind((self.local_ip, self.local_port))
+                self.transport = await self._open_transport()
             except OSError as e:
                 logger.error(f"ソケットバインドに失敗しました (port {self.local_port}): {e}")
-                self.socket.close()
                 raise ConnectionError(f"ポート {self.local_port} の使用に失敗しました: {e}")
             
-            # 応答受信スレッド開始
-            self.running = True
-            self.receive_thread = threading.Thread(target=self._receive_response)
-            self.receive_thread.daemon = True
-            self.receive_thread.start()
-            
-            # 少し待機してスレッドが開始されるのを確認
-            await asyncio.sleep(0.5)
-            
             # SDKモードを有効化（複数回試行）
             for attempt in range(3):
                 logger.info(f"Tello接続試行 {attempt + 1}/3")
                 response = await self._send_command('command', timeout=10)
                 
-                if response and 'ok' in response.lower():
+                if response in _OK_RESPONSES:
                     self.is_connected = True
                     logger.info("Telloに正常に接続されました")
                     
                     # バッテリー残量を確認（接続フラグ設定後に実行）
                     try:
                         battery_response = await self._send_command('battery?', timeout=5)
-                        if battery_response.isdigit():
-                            self.last_battery = int(battery_response)
-                        else:
-                            self.last_battery = 0
-                            logger.warning(f"バッテリー情報の取得に失敗: {battery_response}")
+                        self._update_battery(int(battery_response))
+                    except ValueError:
+                        self.last_battery = 0
+                        logger.warning(f"バッテリー情報の取得に失敗: {battery_response}")
                     except Exception as e:
                         logger.warning(f"バッテリー情報取得エラー: {e}")
                         self.last_battery = 0
@@ -138,21 +357,21 @@ class AsyncTelloController:
                         "success": True,
                         "message": "Telloに正常に接続されました",
                         "battery": self.last_battery,
-                        "timestamp": datetime.now().isoformat()
+                        "timestamp": _now_iso()
                     }
                 elif response == "timeout":
                     logger.info(f"接続タイムアウト (試行 {attempt + 1})")
-                    await asyncio.sleep(1)
+                    await asyncio.sleep(_backoff_delay(attempt))
                 else:
                     # 予期しない応答は詳細をデバッグレベルで記録
                     logger.debug(f"接続試行中の応答: {response}")
-                    await asyncio.sleep(1)
+                    await asyncio.sleep(_backoff_delay(attempt))
             
             self._log_operation("connect", {"status": "failed", "reason": "timeout"})
             return {
                 "success": False,
                 "message": "Tello接続に失敗しました",
-                "timestamp": datetime.now().isoformat()
+                "timestamp": _now_iso()
             }
                 
         except Exception as e:
@@ -161,184 +380,178 @@ class AsyncTelloController:
             return {
                 "success": False,
                 "message": f"接続エラー: {e}",
-                "timestamp": datetime.now().isoformat()
+                "timestamp": _now_iso()
             }
     
-    async def _send_command(self, command: str, timeout: int = 5, retry_on_timeout: bool = True) -> str:
-        """コマンドをTelloに送信し、応答を受信します（直列化対応）"""
-        async with self.command_lock:  # コマンド実行を直列化
-            try:
-                logger.debug(f"送信: {command}")
-                
-                # キューをクリア
-                while not self.response_queue.empty():
-                    try:
-                        self.response_queue.get_nowait()
-                    except asyncio.QueueEmpty:
-                        break
-                
-                # コマンド送信
-                try:
-                    self.socket.sendto(command.encode('utf-8'), (self.tello_ip, self.tello_port))
-                except OSError as e:
-                    logger.error(f"UDP送信エラー: {e}")
-                    return "network_error"
-                
-                # 応答を待機（非同期）
-                try:
-                    response = await asyncio.wait_for(self.response_queue.get(), timeout=timeout)
-                    logger.debug(f"応答: {response}")
-                    return response
-                except asyncio.TimeoutError:
-                    logger.warning(f"コマンドタイムアウト: {command}")
-                    
-                    # タイムアウト時の自動再接続（commandコマンド以外で実行）
-                    if retry_on_timeout and command != 'command':
-                        logger.info("タイムアウトのため自動再接続を試行します...")
-                        # 再接続は別のロック取得が必要なので、ここではretry_on_timeout=Falseで再実行
-                        # 実際の再接続は呼び出し元で処理
-                        return "timeout"
-                    
-                    return "timeout"
-                
-            except Exception as e:
-                logger.error(f"コマンド送信エラー: {e}")
-                return "error"
+    async def _open_transport(self) -> asyncio.DatagramTransport:
+        """Tello通信用のUDPソケットを作成し、イベントループに登録します"""
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_BUFFER_SIZE)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SOCKET_BUFFER_SIZE)
+            sock.bind((self.local_ip, self.local_port))
+            # 宛先を固定し、Tello以外からのデータグラムはカーネルで破棄させる
+            sock.connect((self.tello_ip, self.tello_port))
+        except OSError:
+            sock.close()
+            raise
+        transport, _ = await self.loop.create_datagram_endpoint(lambda: TelloProtocol(self), sock=sock)
+        return transport
     
-    def _receive_response(self):
-        """応答を継続的に受信するスレッド"""
-        while self.running:
+    async def _send_command(self, command: str, timeout: int = 5, retry_on_timeout: bool = True,
+                            deadline: Optional[float] = None) -> str:
+        """コマンドをTelloに送信し、応答を受信します（直列化対応）
+        
+        deadlineを指定した場合は、ロック待ちを含めてloop.time()基準の期限内に応答を待ちます。
+        """
+        if self._queued_commands >= MAX_QUEUED_COMMANDS and command not in _UNSHEDDABLE_COMMANDS:
+            logger.warning(f"待機中のコマンドが上限に達したため拒否します: {command}")
+            return "busy"
+        
+        self._queued_commands += 1
+        try:
+            async with self.command_lock:  # コマンド実行を直列化
+                return await self._send_command_locked(command, timeout, retry_on_timeout, deadline)
+        finally:
+            self._queued_commands -= 1
+    
+    async def _query(self, command: str) -> str:
+        """読み取り専用の問い合わせを送信します（同じ問い合わせが実行中ならその応答を共有）"""
+        task = self._inflight_queries.get(command)
+        if task is None:
+            task = self.loop.create_task(self._send_command(command))
+            self._inflight_queries[command] = task
+            task.add_done_callback(lambda _: self._inflight_queries.pop(command, None))
+        # 一部の呼び出し元がキャンセルされても、共有している他の呼び出し元には影響させない
+        return await asyncio.shield(task)
+    
+    async def _send_command_locked(self, command: str, timeout: float, retry_on_timeout: bool,
+                                   deadline: Optional[float]) -> str:
+        """ロック取得済みの状態でコマンドを送信し、応答を待機します"""
+        loop = self.loop
+        transport = self.transport
+        try:
+            # 期限が指定されていれば残り時間を応答待ちの上限とする
+            if deadline is not None:
+                timeout = min(timeout, deadline - loop.time())
+                if timeout <= 0:
+                    logger.warning(f"期限切れのため送信しません: {command}")
+                    return "timeout"
+            
+            logger.debug("送信: %s", command)
+            
+            # 応答待ちのFutureを登録（未対応の遅延応答は受信時に破棄される）
+            awaiting = self._awaiting = loop.create_future()
+            
+            # コマンド送信（前回分が送信待ちのまま残っていれば積み増さない）
+            if transport.get_write_buffer_size():
+                logger.warning(f"送信バッファが満杯のため送信できませんでした: {command}")
+                return "send_blocked"
             try:
-                self.socket.settimeout(1.0)
-                response, _ = self.socket.recvfrom(1024)
-                
-                # バイナリデータかどうかを事前にチェック
-                if self._is_binary_data(response):
-                    # 状態データなどのバイナリデータは無視
-                    logger.debug("バイナリ状態データを受信、無視します")
-                    continue
-                
-                # エンコーディング処理
-                response_str = None
-                for encoding in ['utf-8', 'ascii', 'latin-1']:
-                    try:
-                        response_str = response.decode(encoding).strip()
-                        # 有効なテキストレスポンスかチェック
-                        if self._is_valid_tello_response(response_str):
-                            break
-                        else:
-                            response_str = None
-                    except UnicodeDecodeError:
-                        continue
-                
-                if response_str is None:
-                    # デコードできないまたは無効なデータはデバッグレベルでログ
-                    logger.debug(f"無効なデータを受信、スキップします: {response[:20]}...")
-                    continue
+                transport.sendto(command.encode('utf-8'))
+            except OSError as e:
+                logger.error(f"UDP送信エラー: {e}")
+                return "network_error"
+            
+            # 応答を待機（wait_forのラッパータスクを作らず、タイマーでFutureを失敗させる）
+            timer = loop.call_later(timeout, _expire_future, awaiting)
+            try:
+                response = await awaiting
+                logger.debug("応答: %s", response)
+                return response
+            except asyncio.TimeoutError:
+                logger.warning(f"コマンドタイムアウト: {command}")
                 
-                logger.debug(f"受信: {response_str}")
-                # asyncio.Queueにスレッドセーフに追加
-                if self.loop and not self.loop.is_closed():
-                    asyncio.run_coroutine_threadsafe(
-                        self.response_queue.put(response_str), 
-                        self.loop
-                    )
+                # タイムアウト時の自動再接続（commandコマンド以外で実行）
+                if retry_on_timeout and command != 'command':
+                    logger.info("タイムアウトのため自動再接続を試行します...")
+                    # 再接続は別のロック取得が必要なので、ここではretry_on_timeout=Falseで再実行
+                    # 実際の再接続は呼び出し元で処理
+                    return "timeout"
                 
-            except socket.timeout:
-                continue
-            except Exception as e:
-                if self.running:
-                    logger.error(f"受信エラー: {e}")
-                break
+                return "timeout"
+            finally:
+                timer.cancel()
+            
+        except Exception as e:
+            logger.error(f"コマンド送信エラー: {e}")
+            return "error"
+        finally:
+            self._awaiting = None
     
-    def _is_binary_data(self, data: bytes) -> bool:
-        """受信データがバイナリデータかどうかを判定"""
-        # 非ASCII文字が多い場合はバイナリとみなす
-        try:
-            data.decode('ascii')
-            # ASCII文字のみで構成されていればテキスト
-            return False
-        except UnicodeDecodeError:
-            # ASCIIでデコードできない場合は、印刷可能文字の割合をチェック
-            printable_count = sum(1 for b in data if 32 <= b <= 126)
-            return printable_count / len(data) < 0.7  # 70%未満が印刷可能文字ならバイナリ
+    def _deliver_response(self, response: str):
+        """受信した応答を待機中のコマンドに渡します（イベントループ上で実行）"""
+        awaiting = self._awaiting
+        if awaiting is not None and not awaiting.done():
+            awaiting.set_result(response)
+        else:
+            logger.debug("待機中のコマンドがない応答を破棄します: %s", response)
     
-    def _is_valid_tello_response(self, text: str) -> bool:
-        """Telloの有効なレスポンスかどうかを判定"""
-        if not text:
-            return False
-        
-        # 既知のTelloレスポンス
-        valid_responses = [
-            'ok', 'error', 'timeout', 'out of range', 'ERROR', 'FALSE', 'TRUE'
-        ]
+    def _handle_datagram(self, response: bytes):
+        """受信したデータグラムを判定し、待機中のコマンドに渡します（イベントループ上で実行）"""
+        # 応答を待っているコマンドがなければ判定せずに破棄（遅延応答や状態データ）
+        awaiting = self._awaiting
+        if awaiting is None or awaiting.done():
+            logger.debug("待機中のコマンドがないデータグラムを破棄します")
+            return
         
-        # 数値のみ（バッテリー残量など）
-        if text.isdigit():
-            return True
+        response_str = _classify_datagram(response)
+        if response_str is None:
+            # バイナリ・デコードできない・無効なデータはデバッグレベルでログ
+            logger.debug("無効なデータを受信、スキップします: %r...", response[:20])
+            return
         
-        # 既知のレスポンス
-        for valid in valid_responses:
-            if valid.lower() in text.lower():
-                return True
-        
-        # 小数点を含む数値（温度など）
-        try:
-            float(text)
-            return True
-        except ValueError:
-            pass
-        
-        # その他のパターン（状態文字列など）
-        return len(text) <= 50  # 長すぎる文字列は状態データの可能性
+        logger.debug("受信: %s", response_str)
+        self._deliver_response(response_str)
     
-    async def _auto_reconnect(self) -> bool:
+    async def _auto_reconnect(self, deadline: Optional[float] = None) -> bool:
         """自動再接続を試行します（ロック競合回避版）"""
         try:
             logger.info("自動再接続を開始します...")
             
-            # 現在の接続をクリーンアップ
             self.is_connected = False
-            if self.socket:
-                with contextlib.suppress(Exception):
-                    self.socket.close()
-            
-            # 少し待機
-            await asyncio.sleep(1)
             
             # ソケット再初期化
             try:
                 # 現在のイベントループを保存
                 self.loop = asyncio.get_running_loop()
                 
-                # 新しいasyncio.Queueを作成
-                self.response_queue = asyncio.Queue()
-                
-                self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-                self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-                self.socket.bind((self.local_ip, self.local_port))
+                # UDPには切断状態がないため、開いているトランスポートはそのまま再利用する
+                # （閉じられている場合のみ作り直す）
+                if self.transport is None or self.transport.is_closing():
+                    await asyncio.sleep(1)
+                    self.transport = await self._open_transport()
                 
-                # 応答受信スレッドが停止していれば再開
-                if not self.receive_thread or not self.receive_thread.is_alive():
-                    self.running = True
-                    self.receive_thread = threading.Thread(target=self._receive_response)
-                    self.receive_thread.daemon = True
-                    self.receive_thread.start()
-                    await asyncio.sleep(0.5)
+                # SDKモードは送信元IPに紐づいて維持されるため、まずbattery?で疎通を確認
+                probe_response = await self._send_command('battery?', timeout=2, retry_on_timeout=False, deadline=deadline)
+                try:
+                    self._update_battery(int(probe_response))
+                except ValueError:
+                    pass  # 数値以外（timeout等）ならSDKモードの再有効化へ
+                else:
+                    self.is_connected = True
+                    logger.info("自動再接続に成功しました（SDKモード維持）")
+                    return True
                 
-                # SDKモードを有効化（1回のみ試行）
-                logger.info("SDK再接続を試行中...")
-                response = await self._send_command('command', timeout=10, retry_on_timeout=False)
+                # SDKモードを有効化（最大2回試行）
+                for attempt in range(2):
+                    if attempt:
+                        await asyncio.sleep(_backoff_delay(attempt))
+                    logger.info(f"SDK再接続を試行中... ({attempt + 1}/2)")
+                    response = await self._send_command('command', timeout=10, retry_on_timeout=False, deadline=deadline)
+                    if response in _OK_RESPONSES:
+                        break
                 
-                if response and 'ok' in response.lower():
+                if response in _OK_RESPONSES:
                     self.is_connected = True
                     logger.info("自動再接続に成功しました")
                     
                     # バッテリー残量を確認
                     try:
-                        battery_response = await self._send_command('battery?', timeout=5, retry_on_timeout=False)
-                        self.last_battery = int(battery_response) if battery_response.isdigit() else 0
-                    except Exception:
+                        battery_response = await self._send_command('battery?', timeout=5, retry_on_timeout=False, deadline=deadline)
+                        self._update_battery(int(battery_response))
+                    except Exception:  # 数値以外の応答（ValueError）を含む
                         self.last_battery = 0
                     
                     return True
@@ -354,19 +567,32 @@ class AsyncTelloController:
             logger.error(f"自動再接続中にエラーが発生しました: {e}")
             return False
     
-    async def get_battery(self) -> Dict[str, Any]:
-        """バッテリー残量を取得します"""
+    def _update_battery(self, battery: int):
+        """取得したバッテリー残量を取得時刻とともに記録します"""
+        self.last_battery = battery
+        self._battery_read_at = time.monotonic()
+    
+    async def get_battery(self, use_cache: bool = True) -> Dict[str, Any]:
+        """バッテリー残量を取得します（直近の取得値が有効期間内ならコマンドを送信しない）"""
         if not self.is_connected:
-            return {"success": False, "message": "Telloに接続されていません"}
+            return _NOT_CONNECTED_RESULT
+        
+        if use_cache and self.last_battery and time.monotonic() - self._battery_read_at < BATTERY_CACHE_TTL:
+            return {
+                "success": True,
+                "battery": self.last_battery,
+                "cached": True,
+                "timestamp": _now_iso()
+            }
         
-        response = await self._send_command('battery?')
+        response = await self._query('battery?')
         try:
             battery = int(response)
-            self.last_battery = battery
+            self._update_battery(battery)
             return {
                 "success": True,
                 "battery": battery,
-                "timestamp": datetime.now().isoformat()
+                "timestamp": _now_iso()
             }
         except ValueError:
             return {
@@ -386,13 +612,13 @@ class AsyncTelloController:
             "message": f"飛行状態をリセットしました: {old_status} -> landed",
             "old_status": old_status,
             "new_status": "landed",
-            "timestamp": datetime.now().isoformat()
+            "timestamp": _now_iso()
         }
 
     async def takeoff(self) -> Dict[str, Any]:
         """離陸します"""
         if not self.is_connected:
-            return {"success": False, "message": "Telloに接続されていません"}
+            return _NOT_CONNECTED_RESULT
         
         if self.flight_status == "flying":
             # 状態確認のため実際のドローンの状態をチェック
@@ -418,7 +644,7 @@ class AsyncTelloController:
         logger.info("離陸を開始します...")
         response = await self._send_command('takeoff', timeout=25)  # タイムアウトを25秒に延長
         
-        if 'ok' in response.lower():
+        if response in _OK_RESPONSES:
             self.flight_status = "flying"
             self._log_operation("takeoff", {"status": "success"})
             logger.info("離陸に成功しました")
@@ -426,7 +652,7 @@ class AsyncTelloController:
                 "success": True,
                 "message": "離陸に成功しました",
                 "flight_status": self.flight_status,
-                "timestamp": datetime.now().isoformat()
+                "timestamp": _now_iso()
             }
         elif response == "timeout":
             self._log_operation("takeoff", {"status": "timeout"})
@@ -440,7 +666,7 @@ class AsyncTelloController:
                 # 再接続後にコマンドを再実行
                 retry_response = await self._send_command('takeoff', timeout=25, retry_on_timeout=False)
                 
-                if 'ok' in retry_response.lower():
+                if retry_response in _OK_RESPONSES:
                     self.flight_status = "flying"
                     self._log_operation("takeoff", {"status": "success_after_reconnect"})
                     logger.info("再接続後に離陸に成功しました")
@@ -449,7 +675,7 @@ class AsyncTelloController:
                         "message": "再接続後に離陸に成功しました",
                         "flight_status": self.flight_status,
                         "reconnected": True,
-                        "timestamp": datetime.now().isoformat()
+                        "timestamp": _now_iso()
                     }
                 else:
                     logger.error(f"再接続後も離陸に失敗: {retry_response}")
@@ -457,7 +683,7 @@ class AsyncTelloController:
                         "success": False,
                         "message": f"再接続後も離陸に失敗しました: {retry_response}",
                         "reconnected": True,
-                        "timestamp": datetime.now().isoformat()
+                        "timestamp": _now_iso()
                     }
             else:
                 logger.error("離陸コマンドタイムアウト、自動再接続にも失敗")
@@ -465,7 +691,7 @@ class AsyncTelloController:
                     "success": False,
                     "message": "離陸コマンドがタイムアウトし、自動再接続にも失敗しました。ドローンの状態を確認してください。",
                     "reconnected": False,
-                    "timestamp": datetime.now().isoformat()
+                    "timestamp": _now_iso()
                 }
         else:
             self._log_operation("takeoff", {"status": "failed", "response": response})
@@ -473,35 +699,35 @@ class AsyncTelloController:
             return {
                 "success": False,
                 "message": f"離陸に失敗しました: {response}",
-                "timestamp": datetime.now().isoformat()
+                "timestamp": _now_iso()
             }
     
     async def land(self) -> Dict[str, Any]:
         """着陸します"""
         if not self.is_connected:
-            return {"success": False, "message": "Telloに接続されていません"}
+            return _NOT_CONNECTED_RESULT
         
         if self.flight_status != "flying":
-            return {"success": False, "message": "飛行中ではありません"}
+            return _NOT_FLYING_RESULT
         
         logger.debug("着陸中...")
         response = await self._send_command('land', timeout=15)
         
-        if 'ok' in response.lower():
+        if response in _OK_RESPONSES:
             self.flight_status = "landed"
             self._log_operation("land", {"status": "success"})
             return {
                 "success": True,
                 "message": "着陸に成功しました",
                 "flight_status": self.flight_status,
-                "timestamp": datetime.now().isoformat()
+                "timestamp": _now_iso()
             }
         else:
             self._log_operation("land", {"status": "failed", "response": response})
             return {
                 "success": False,
                 "message": f"着陸に失敗しました: {response}",
-                "timestamp": datetime.now().isoformat()
+                "timestamp": _now_iso()
             }
     
     async def emergency(self) -> Dict[str, Any]:
@@ -509,220 +735,152 @@ class AsyncTelloController:
         logger.debug("緊急停止!")
         response = await self._send_command('emergency')
         
-        if 'ok' in response.lower():
+        if response in _OK_RESPONSES:
             self.flight_status = "emergency"
             self._log_operation("emergency", {"status": "success"})
             return {
                 "success": True,
                 "message": "緊急停止を実行しました",
                 "flight_status": self.flight_status,
-                "timestamp": datetime.now().isoformat()
+                "timestamp": _now_iso()
             }
         else:
             self._log_operation("emergency", {"status": "failed", "response": response})
             return {
                 "success": False,
                 "message": f"緊急停止に失敗しました: {response}",
-                "timestamp": datetime.now().isoformat()
+                "timestamp": _now_iso()
             }
     
     async def move(self, direction: str, distance: int) -> Dict[str, Any]:
         """移動します"""
         if not self.is_connected:
-            return {"success": False, "message": "Telloに接続されていません"}
+            return _NOT_CONNECTED_RESULT
         
         if self.flight_status != "flying":
-            return {"success": False, "message": "飛行中ではありません"}
+            return _NOT_FLYING_RESULT
         
         # 方向と距離の検証
-        valid_directions = ['up', 'down', 'left', 'right', 'forward', 'back']
-        if direction not in valid_directions:
+        if direction not in MOVE_DIRECTIONS:
             return {"success": False, "message": f"無効な方向です: {direction}"}
         
         if not (20 <= distance <= 500):
-            return {"success": False, "message": "距離は20-500cmの範囲で指定してください"}
+            return _INVALID_DISTANCE_RESULT
         
-        logger.debug(f"{direction} {distance}cm移動中...")
-        response = await self._send_command(f'{direction} {distance}', timeout=10)
-        
-        if 'ok' in response.lower():
-            self._log_operation("move", {"direction": direction, "distance": distance, "status": "success"})
-            return {
-                "success": True,
-                "message": f"{direction}に{distance}cm移動しました",
-                "timestamp": datetime.now().isoformat()
-            }
-        elif response == "timeout":
-            self._log_operation("move", {"direction": direction, "distance": distance, "status": "timeout"})
-            
-            # 自動再接続を試行
-            logger.info("移動コマンドタイムアウト、自動再接続を試行します...")
-            reconnect_success = await self._auto_reconnect()
-            
-            if reconnect_success:
-                logger.info("再接続成功、移動コマンドを再実行します")
-                # 再接続後にコマンドを再実行
-                retry_response = await self._send_command(f'{direction} {distance}', timeout=10, retry_on_timeout=False)
-                
-                if 'ok' in retry_response.lower():
-                    self._log_operation("move", {"direction": direction, "distance": distance, "status": "success_after_reconnect"})
-                    return {
-                        "success": True,
-                        "message": f"再接続後に{direction}に{distance}cm移動しました",
-                        "reconnected": True,
-                        "timestamp": datetime.now().isoformat()
-                    }
-                else:
-                    return {
-                        "success": False,
-                        "message": f"再接続後も移動に失敗しました: {retry_response}",
-                        "reconnected": True,
-                        "timestamp": datetime.now().isoformat()
-                    }
-            else:
-                return {
-                    "success": False,
-                    "message": "移動コマンドがタイムアウトし、自動再接続にも失敗しました。ドローンの状態を確認してください。",
-                    "reconnected": False,
-                    "timestamp": datetime.now().isoformat()
-                }
-        else:
-            self._log_operation("move", {"direction": direction, "distance": distance, "status": "failed", "response": response})
-            
-            # Auto landエラーの場合は特別な処理
-            if "auto land" in response.lower():
-                # 飛行状態を着陸に更新
-                self.flight_status = "landed"
-                
-                # バッテリー残量を確認
-                battery_info = await self.get_battery()
-                current_battery = battery_info.get('battery', 0)
-                
-                return {
-                    "success": False,
-                    "message": f"ドローンが自動着陸しました。原因: {response}",
-                    "details": {
-                        "reason": "auto_land",
-                        "battery": current_battery,
-                        "flight_status": self.flight_status,
-                        "recommendations": [
-                            "バッテリー残量を確認してください（推奨: 30%以上）",
-                            "ドローンとの距離が遠すぎないか確認してください",
-                            "周囲に障害物がないか確認してください",
-                            "再度離陸する前に少し待機してください"
-                        ]
-                    },
-                    "raw_response": response,
-                    "timestamp": datetime.now().isoformat()
-                }
-            # Motor stopエラーの場合は特別なメッセージ
-            elif "motor stop" in response.lower():
-                return {
-                    "success": False,
-                    "message": "移動に失敗しました: モーターが停止しています。ドローンが着陸しているか、障害物を検知した可能性があります。",
-                    "raw_response": response,
-                    "timestamp": datetime.now().isoformat()
-                }
-            else:
-                return {
-                    "success": False,
-                    "message": f"移動に失敗しました: {response}",
-                    "timestamp": datetime.now().isoformat()
-                }
+        logger.debug("%s %dcm移動中...", direction, distance)
+        return await self._execute_flight_command(
+            "move", f'{direction} {distance}', "移動",
+            f"{direction}に{distance}cm移動しました",
+            {"direction": direction, "distance": distance},
+        )
     
     async def rotate(self, direction: str, degrees: int) -> Dict[str, Any]:
         """回転します"""
         if not self.is_connected:
-            return {"success": False, "message": "Telloに接続されていません"}
+            return _NOT_CONNECTED_RESULT
         
         if self.flight_status != "flying":
-            return {"success": False, "message": "飛行中ではありません"}
+            return _NOT_FLYING_RESULT
         
         # 回転方向と角度の検証
-        if direction not in ['cw', 'ccw']:
+        if direction not in ROTATE_DIRECTIONS:
             return {"success": False, "message": f"無効な回転方向です: {direction}"}
         
         if not (1 <= degrees <= 360):
-            return {"success": False, "message": "角度は1-360度の範囲で指定してください"}
+            return _INVALID_DEGREES_RESULT
         
-        logger.debug(f"{direction} {degrees}度回転中...")
-        response = await self._send_command(f'{direction} {degrees}', timeout=10)
+        logger.debug("%s %d度回転中...", direction, degrees)
+        return await self._execute_flight_command(
+            "rotate", f'{direction} {degrees}', "回転",
+            f"{direction}方向に{degrees}度回転しました",
+            {"direction": direction, "degrees": degrees},
+        )
+    
+    async def _execute_flight_command(self, operation: str, command: str, action: str,
+                                      success_message: str, details: Dict[str, Any]) -> Dict[str, Any]:
+        """飛行コマンドを送信し、タイムアウト時の再接続や自動着陸を含めて結果を返します"""
+        # 再接続・再試行を含めて期限内に収める
+        deadline = self.loop.time() + FLIGHT_COMMAND_DEADLINE
+        response = await self._send_command(command, timeout=FLIGHT_COMMAND_TIMEOUT, deadline=deadline)
         
-        if 'ok' in response.lower():
-            self._log_operation("rotate", {"direction": direction, "degrees": degrees, "status": "success"})
+        if response in _OK_RESPONSES:
+            self._log_operation(operation, {**details, "status": "success"})
             return {
                 "success": True,
-                "message": f"{direction}方向に{degrees}度回転しました",
-                "timestamp": datetime.now().isoformat()
+                "message": success_message,
+                "timestamp": _now_iso()
             }
         elif response == "timeout":
-            self._log_operation("rotate", {"direction": direction, "degrees": degrees, "status": "timeout"})
+            self._log_operation(operation, {**details, "status": "timeout"})
             
             # 自動再接続を試行
-            logger.info("回転コマンドタイムアウト、自動再接続を試行します...")
-            reconnect_success = await self._auto_reconnect()
+            logger.info(f"{action}コマンドタイムアウト、自動再接続を試行します...")
+            reconnect_success = await self._auto_reconnect(deadline)
             
             if reconnect_success:
-                logger.info("再接続成功、回転コマンドを再実行します")
+                await asyncio.sleep(_backoff_delay(0))
+                # 残り時間が1回分の応答待ちに満たなければ再実行しない
+                # （短い待ち時間で失敗扱いにすると、動作中の機体の遅れた応答が次のコマンドの応答と取り違えられる）
+                if deadline - self.loop.time() < FLIGHT_COMMAND_TIMEOUT:
+                    logger.warning(f"再接続しましたが、期限内に{action}コマンドを再実行できないため中止します")
+                    return {
+                        "success": False,
+                        "message": f"{action}コマンドがタイムアウトしました。再接続しましたが、期限内に再実行できないため再試行していません。ドローンの状態を確認してください。",
+                        "reconnected": True,
+                        "timestamp": _now_iso()
+                    }
+                
+                logger.info(f"再接続成功、{action}コマンドを再実行します")
                 # 再接続後にコマンドを再実行
-                retry_response = await self._send_command(f'{direction} {degrees}', timeout=10, retry_on_timeout=False)
+                retry_response = await self._send_command(command, timeout=FLIGHT_COMMAND_TIMEOUT, retry_on_timeout=False, deadline=deadline)
                 
-                if 'ok' in retry_response.lower():
-                    self._log_operation("rotate", {"direction": direction, "degrees": degrees, "status": "success_after_reconnect"})
+                if retry_response in _OK_RESPONSES:
+                    self._log_operation(operation, {**details, "status": "success_after_reconnect"})
                     return {
                         "success": True,
-                        "message": f"再接続後に{direction}方向に{degrees}度回転しました",
+                        "message": f"再接続後に{success_message}",
                         "reconnected": True,
-                        "timestamp": datetime.now().isoformat()
+                        "timestamp": _now_iso()
                     }
                 else:
                     return {
                         "success": False,
-                        "message": f"再接続後も回転に失敗しました: {retry_response}",
+                        "message": f"再接続後も{action}に失敗しました: {retry_response}",
                         "reconnected": True,
-                        "timestamp": datetime.now().isoformat()
+                        "timestamp": _now_iso()
                     }
             else:
                 return {
                     "success": False,
-                    "message": "回転コマンドがタイムアウトし、自動再接続にも失敗しました。ドローンの状態を確認してください。",
+                    "message": f"{action}コマンドがタイムアウトし、自動再接続にも失敗しました。ドローンの状態を確認してください。",
                     "reconnected": False,
-                    "timestamp": datetime.now().isoformat()
+                    "timestamp": _now_iso()
                 }
         else:
-            self._log_operation("rotate", {"direction": direction, "degrees": degrees, "status": "failed", "response": response})
+            self._log_operation(operation, {**details, "status": "failed", "response": response})
+            response_lower = response.lower()
             
             # Auto landエラーの場合は特別な処理
-            if "auto land" in response.lower():
+            if "auto land" in response_lower:
                 # 飛行状態を着陸に更新
                 self.flight_status = "landed"
                 
                 # バッテリー残量を確認
-                battery_info = await self.get_battery()
-                current_battery = battery_info.get('battery', 0)
-                
+                battery_info = await self.get_battery(use_cache=False)
+                return _auto_land_response(response, battery_info.get('battery', 0), self.flight_status)
+            # Motor stopエラーの場合は特別なメッセージ
+            elif "motor stop" in response_lower:
                 return {
                     "success": False,
-                    "message": f"ドローンが自動着陸しました。原因: {response}",
-                    "details": {
-                        "reason": "auto_land",
-                        "battery": current_battery,
-                        "flight_status": self.flight_status,
-                        "recommendations": [
-                            "バッテリー残量を確認してください（推奨: 30%以上）",
-                            "ドローンとの距離が遠すぎないか確認してください",
-                            "周囲に障害物がないか確認してください",
-                            "再度離陸する前に少し待機してください"
-                        ]
-                    },
+                    "message": f"{action}に失敗しました: モーターが停止しています。ドローンが着陸しているか、障害物を検知した可能性があります。",
                     "raw_response": response,
-                    "timestamp": datetime.now().isoformat()
+                    "timestamp": _now_iso()
                 }
             else:
                 return {
                     "success": False,
-                    "message": f"回転に失敗しました: {response}",
-                    "timestamp": datetime.now().isoformat()
+                    "message": f"{action}に失敗しました: {response}",
+                    "timestamp": _now_iso()
                 }
     
     async def get_status(self) -> Dict[str, Any]:
@@ -733,25 +891,18 @@ class AsyncTelloController:
             "flight_status": self.flight_status,
             "battery": self.last_battery,
             "video_streaming": self.video_streaming,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": _now_iso()
         }
     
     def _log_operation(self, operation: str, details: Dict[str, Any]):
         """操作ログを記録します"""
-        log_entry = {
-            "timestamp": datetime.now().isoformat(),
-            "operation": operation,
-            "details": details
-        }
-        self.operation_log.append(log_entry)
-        
-        # ログを最新100件に制限
-        if len(self.operation_log) > 100:
-            self.operation_log = self.operation_log[-100:]
+        # 古いエントリはdequeが自動的に破棄する（整形は参照時に行う）
+        self.operation_log.append((time.time(), operation, details))
     
     async def _try_video_capture_methods(self) -> Tuple[bool, str]:
         """Try different video capture methods and return success status and method name."""
         capture_methods = [
+            ("PyAV", self._start_pyav_capture),
             ("OpenCV", self._start_opencv_capture),
             ("FFmpeg", self._start_ffmpeg_capture),
             ("Simple UDP", self._start_simple_udp_capture)
@@ -773,7 +924,7 @@ class AsyncTelloController:
     async def start_video_stream(self) -> Dict[str, Any]:
         """ビデオストリーミングを開始します（改善版）"""
         if not self.is_connected:
-            return {"success": False, "message": "Telloに接続されていません"}
+            return _NOT_CONNECTED_RESULT
         
         try:
             # 既存のビデオストリーミングを停止
@@ -788,7 +939,7 @@ class AsyncTelloController:
                 logger.info(f"ビデオストリーミング有効化試行 {attempt + 1}/3")
                 response = await self._send_command('streamon', timeout=10)
                 
-                if 'ok' in response.lower():
+                if response in _OK_RESPONSES:
                     streamon_success = True
                     logger.info("Telloビデオストリーミングコマンドが成功しました")
                     break
@@ -816,7 +967,7 @@ class AsyncTelloController:
                     "success": True,
                     "message": f"{method_name}でビデオストリーミングを開始しました",
                     "method": method_name.lower(),
-                    "timestamp": datetime.now().isoformat()
+                    "timestamp": _now_iso()
                 }
             
             # すべての方法が失敗した場合
@@ -833,6 +984,57 @@ class AsyncTelloController:
                 "message": f"ビデオストリーミング開始エラー: {e}"
             }
     
+    async def _start_pyav_capture(self) -> bool:
+        """PyAVでUDPのH.264ストリームを直接デコードしてビデオキャプチャを開始（VideoCaptureのフレームキューを介さない低遅延版）"""
+        if av is None:
+            logger.info("PyAVがインストールされていないため、PyAVでのキャプチャをスキップします")
+            return False
+        
+        stream_url = f'udp://0.0.0.0:{self.video_port}'
+        try:
+            # ストリームの解析でブロックするため、オープンはスレッドプールで行う
+            container = await self.loop.run_in_executor(None, functools.partial(
+                av.open, stream_url, options=FFMPEG_LOW_DELAY_OPTIONS, timeout=(5.0, 3.0)))
+        except Exception as e:
+            logger.warning(f"PyAVでビデオストリームを開けませんでした ({stream_url}): {e}")
+            return False
+        
+        self.video_streaming = True
+        self.use_pyav = True
+        
+        # PyAVフレーム取得スレッドを開始
+        self._pyav_thread = threading.Thread(target=self._capture_pyav_frames, args=(container,))
+        self._pyav_thread.daemon = True
+        self._pyav_thread.start()
+        
+        # テストフレームを取得して動作確認
+        test_attempts = 0
+        while test_attempts < 25:
+            if self.latest_frame is not None:
+                logger.info(f"PyAVビデオキャプチャが正常に動作しています ({stream_url})")
+                return True
+            await asyncio.sleep(0.2)
+            test_attempts += 1
+        
+        # フレームが得られなければ停止し、次の方法がポートをバインドできるようスレッドの終了を待つ
+        logger.warning("PyAVでフレームを取得できませんでした")
+        self.video_streaming = False
+        self.use_pyav = False
+        await self._join_pyav_thread()
+        return False
+    
+    async def _join_pyav_thread(self):
+        """PyAVスレッドの終了（コンテナのクローズによるUDPポートの解放）を待ちます"""
+        thread = self._pyav_thread
+        if thread is None:
+            return
+        # スレッドはパケットごとに停止フラグを確認し、受信が途絶えても読み取りタイムアウトで抜ける
+        await self.loop.run_in_executor(None, thread.join, PYAV_JOIN_TIMEOUT)
+        if thread.is_alive():
+            logger.warning("PyAVキャプチャスレッドが時間内に終了しませんでした")
+        else:
+            self._pyav_thread = None
+    
     async def _start_opencv_capture(self) -> bool:
         """OpenCVを使用してビデオキャプチャを開始（改善版）"""
         try:
@@ -847,7 +1049,7 @@ class AsyncTelloController:
                 logger.info(f"ビデオストリーム接続を試行: {stream_url}")
                 
                 # OpenCVでビデオキャプチャを開始
-                self.cap = cv2.VideoCapture(stream_url, cv2.CAP_FFMPEG)
+                self.cap = _open_video_capture(stream_url)
                 
                 if self.cap.isOpened():
                     # OpenCVの設定を最適化（フレームレート向上）
@@ -924,7 +1126,11 @@ class AsyncTelloController:
                 # 設定1: 基本的な設定
                 [
                     'ffmpeg',
-                    '-fflags', '+genpts',
+                    '-fflags', '+genpts+nobuffer',
+                    '-flags', 'low_delay',
+                    '-probesize', '32',
+                    '-analyzeduration', '0',
+                    '-max_delay', '0',
                     '-thread_queue_size', '512',
                     '-i', f'udp://0.0.0.0:{self.video_port}',
                     '-f', 'rawvideo',
@@ -938,10 +1144,12 @@ class AsyncTelloController:
                 # 設定2: より堅牢な設定
                 [
                     'ffmpeg',
-                    '-fflags', '+genpts',
+                    '-fflags', '+genpts+nobuffer',
+                    '-flags', 'low_delay',
                     '-thread_queue_size', '1024',
                     '-probesize', '32',
                     '-analyzeduration', '0',
+                    '-max_delay', '0',
                     '-i', f'udp://0.0.0.0:{self.video_port}',
                     '-f', 'rawvideo',
                     '-pix_fmt', 'bgr24',
@@ -964,6 +1172,7 @@ class AsyncTelloController:
                         stderr=subprocess.PIPE,
                         bufsize=10**6  # バッファサイズを調整
                     )
+                    _enlarge_pipe(self.ffmpeg_process.stdout)
                     
                     self.video_streaming = True
                     self.use_ffmpeg = True
@@ -1029,8 +1238,9 @@ class AsyncTelloController:
             try:
                 self.udp_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
                 self.udp_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+                self.udp_socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_BUFFER_SIZE)
                 self.udp_socket.bind(('0.0.0.0', self.video_port))
-                self.udp_socket.settimeout(5.0)  # 5秒タイムアウト
+                self.udp_socket.setblocking(False)  # 待機はスレッド側のセレクタで行う
             except OSError as e:
                 logger.error(f"ビデオUDPソケットバインドに失敗: {e}")
                 if self.udp_socket:
@@ -1042,7 +1252,8 @@ class AsyncTelloController:
             self.use_simple_udp = True
             self.use_ffmpeg = False
             
-            # シンプルUDPフレーム取得スレッドを開始
+            # シンプルUDPフレーム取得スレッドを開始（ソケットペアはスレッド終了時に閉じる）
+            self._udp_wakeup = socket.socketpair()
             video_thread = threading.Thread(target=self._capture_simple_udp_frames)
             video_thread.daemon = True
             video_thread.start()
@@ -1062,21 +1273,30 @@ class AsyncTelloController:
             logger.warning("シンプルUDPでフレームを取得できませんでした")
             self.video_streaming = False
             self.use_simple_udp = False
-            if self.udp_socket:
-                self.udp_socket.close()
-                self.udp_socket = None
+            self._close_udp_socket()
             return False
             
         except Exception as e:
             logger.error(f"シンプルUDPキャプチャエラー: {e}")
-            if self.udp_socket:
-                try:
-                    self.udp_socket.close()
-                except:
-                    pass
-                self.udp_socket = None
+            self._close_udp_socket()
             return False
     
+    def _close_udp_socket(self):
+        """シンプルUDPソケットを閉じ、受信待ちのスレッドを起こします"""
+        wakeup = self._udp_wakeup
+        if wakeup is not None:
+            try:
+                wakeup[1].send(b'\0')
+            except OSError:
+                pass  # スレッドが既に終了してソケットペアを閉じている
+        if self.udp_socket:
+            try:
+                self.udp_socket.close()
+            except:
+                pass
+            finally:
+                self.udp_socket = None
+    
     async def stop_video_stream(self) -> Dict[str, Any]:
         """ビデオストリーミングを停止します"""
         try:
@@ -1099,17 +1319,16 @@ class AsyncTelloController:
                     self.ffmpeg_process = None
             
             # シンプルUDPソケットを停止
-            if self.udp_socket:
-                try:
-                    self.udp_socket.close()
-                except:
-                    pass
-                finally:
-                    self.udp_socket = None
+            self._close_udp_socket()
             
             self.use_ffmpeg = False
+            self.use_pyav = False
+            # PyAVスレッドがUDPポートを解放するまで待つ
+            await self._join_pyav_thread()
             self.use_simple_udp = False
             self.latest_frame = None
+            self._encoded_frame = (None, b"", "")
+            self._encoded_web_frame = (None, b"")
             
             # ビデオストリーミングを無効化
             if self.is_connected:
@@ -1119,7 +1338,7 @@ class AsyncTelloController:
             return {
                 "success": True,
                 "message": "ビデオストリーミングを停止しました",
-                "timestamp": datetime.now().isoformat()
+                "timestamp": _now_iso()
             }
             
         except Exception as e:
@@ -1135,7 +1354,7 @@ class AsyncTelloController:
             if self.cap:
                 self.cap.release()
             time.sleep(2)
-            self.cap = cv2.VideoCapture(f'udp://@0.0.0.0:{self.video_port}')
+            self.cap = _open_video_capture(f'udp://@0.0.0.0:{self.video_port}')
             if self.cap.isOpened():
                 self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
                 self.cap.set(cv2.CAP_PROP_FPS, 30)
@@ -1161,7 +1380,7 @@ class AsyncTelloController:
                 self.cap.release()
             time.sleep(1)
             # より堅牢な再初期化
-            self.cap = cv2.VideoCapture(f'udp://0.0.0.0:{self.video_port}', cv2.CAP_FFMPEG)
+            self.cap = _open_video_capture(f'udp://0.0.0.0:{self.video_port}')
             if self.cap.isOpened():
                 # 基本設定のみ適用（エラーを避けるため）
                 self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
@@ -1174,6 +1393,31 @@ class AsyncTelloController:
             logger.error(f"ビデオキャプチャ再初期化エラー: {reinit_e}")
             return False
 
+    def _capture_pyav_frames(self, container):
+        """PyAVでデコードしたフレームを継続的に取得するスレッド"""
+        logger.info("PyAVビデオフレームキャプチャスレッドを開始しました")
+        try:
+            # デコードできないパケットが続いても停止要求に応じられるよう、パケット単位でフラグを確認する
+            for packet in container.demux(video=0):
+                if not (self.video_streaming and self.use_pyav):
+                    break
+                try:
+                    frames = packet.decode()
+                except av.error.InvalidDataError as e:
+                    # 途中参加やパケット欠損による破損は次のキーフレームで回復する
+                    logger.debug("H.264デコードエラー: %s", e)
+                    continue
+                for frame in frames:
+                    # to_ndarrayは毎回新しい配列を返すため、そのまま公開できる
+                    self.latest_frame = frame.to_ndarray(format='bgr24')
+        except Exception as e:
+            # 読み取りタイムアウトやストリームの破損（停止済みなら想定内）
+            if self.video_streaming and self.use_pyav:
+                logger.error(f"PyAVフレームキャプチャエラー: {e}")
+        finally:
+            container.close()
+        logger.info("PyAVビデオフレームキャプチャスレッドが終了しました")
+
     def _capture_video_frames(self):
         """ビデオフレームを継続的にキャプチャするスレッド（改善版）"""
         consecutive_failures = 0
@@ -1182,26 +1426,23 @@ class AsyncTelloController:
         successful_frames = 0
         
         logger.info("ビデオフレームキャプチャスレッドを開始しました")
+        debug = logger.isEnabledFor(logging.DEBUG)
         
         while self.video_streaming and self.cap and self.cap.isOpened():
             try:
                 ret, frame = self.cap.read()
-                if ret and frame is not None and frame.size > 0:
-                    # フレームが正常に取得できた場合
+                # read()が成功を返すのは空でない画像をデコードできた場合のみなので、サイズの確認は不要
+                if ret:
                     consecutive_failures = 0
                     frame_skip_count = 0
                     successful_frames += 1
+                    self.latest_frame = frame
                     
-                    # フレームサイズをチェック
-                    if frame.shape[0] > 0 and frame.shape[1] > 0:
-                        with self.frame_lock:
-                            self.latest_frame = frame
-                        
-                        # 最初のフレーム取得時にログ出力
-                        if successful_frames == 1:
-                            logger.info(f"最初のビデオフレームを取得しました (サイズ: {frame.shape})")
-                        elif successful_frames % 100 == 0:  # 100フレームごとにログ
-                            logger.debug(f"ビデオフレーム取得中... ({successful_frames} フレーム)")
+                    # 最初のフレーム取得時にログ出力
+                    if successful_frames == 1:
+                        logger.info(f"最初のビデオフレームを取得しました (サイズ: {frame.shape})")
+                    elif debug and successful_frames % 100 == 0:  # 100フレームごとにログ
+                        logger.debug("ビデオフレーム取得中... (%d フレーム)", successful_frames)
                 else:
                     # フレーム取得に失敗した場合
                     consecutive_failures += 1
@@ -1245,24 +1486,28 @@ class AsyncTelloController:
         frame_height = 480
         frame_size = frame_width * frame_height * 3  # BGR24
         
+        # 部分読み込みのたびにbytesを確保せず、事前確保した読み込みバッファへ直接読み込む
+        read_buffer = bytearray(frame_size)
+        read_view = memoryview(read_buffer)
+        
         consecutive_failures = 0
         max_failures = 10
         
         while self.video_streaming and self.ffmpeg_process:
             try:
                 # FFmpegからフレームデータを読み取り
-                raw_frame = self.ffmpeg_process.stdout.read(frame_size)
+                read_size = self.ffmpeg_process.stdout.readinto(read_view)
                 
-                if len(raw_frame) == frame_size:
-                    # バイトデータをnumpy配列に変換
-                    frame = np.frombuffer(raw_frame, dtype=np.uint8)
+                if read_size == frame_size:
+                    # 読み込みバッファは次のフレームで上書きされるため、公開するフレームはコピーして
+                    # 所有権を読み出し側へ渡す（エンコード中に書き換わらないよう1フレーム1回のコピー）
+                    frame = np.frombuffer(read_buffer, dtype=np.uint8).copy()
                     frame = frame.reshape((frame_height, frame_width, 3))
                     
                     consecutive_failures = 0
-                    with self.frame_lock:
-                        self.latest_frame = frame
+                    self.latest_frame = frame
                         
-                elif len(raw_frame) == 0:
+                elif not read_size:
                     # プロセスが終了した
                     logger.info("FFmpegプロセスが終了しました")
                     break
@@ -1292,28 +1537,55 @@ class AsyncTelloController:
         
         logger.info("シンプルUDPビデオフレームキャプチャスレッドを開始しました")
         
-        while self.video_streaming and self.udp_socket:
+        udp_socket = self.udp_socket
+        wakeup = self._udp_wakeup
+        # PyAVがあれば受信したH.264データをそのままデコードする（無ければテスト画像で受信を確認）
+        codec = av.CodecContext.create('h264', 'r') if av is not None else None
+        # 受信バッファは一度だけ確保し、パケットごとのbytes生成を避ける
+        packet_view = memoryview(bytearray(65536))  # 最大64KB
+        # データ到着か停止通知まで待機する（停止時にタイムアウトを待たずに抜ける）
+        selector = selectors.DefaultSelector()
+        selector.register(udp_socket, selectors.EVENT_READ)
+        selector.register(wakeup[0], selectors.EVENT_READ)
+        
+        while self.video_streaming and self.udp_socket is udp_socket:
             try:
+                events = selector.select(timeout=5.0)
+                if not events:
+                    consecutive_failures += 1
+                    if consecutive_failures >= max_failures:
+                        logger.warning(f"UDPソケットタイムアウトが連続発生（{consecutive_failures}回）")
+                        break
+                    continue
+                if any(key.fileobj is wakeup[0] for key, _ in events):
+                    break  # 停止が要求された
+                
                 # UDPパケットを受信
-                data, addr = self.udp_socket.recvfrom(65536)  # 最大64KB
+                nbytes, addr = udp_socket.recvfrom_into(packet_view)
                 
-                if len(data) > 0:
-                    # H.264データを受信した場合、簡単な画像として保存
-                    # 実際のH.264デコードは複雑なので、ここでは受信確認のみ
+                if nbytes > 0:
+                    data = packet_view[:nbytes]
                     consecutive_failures = 0
                     successful_frames += 1
                     
                     # 最初のパケット受信時にログ出力
                     if successful_frames == 1:
-                        logger.info(f"最初のUDPビデオパケットを受信しました (サイズ: {len(data)} bytes, from: {addr})")
+                        logger.info(f"最初のUDPビデオパケットを受信しました (サイズ: {nbytes} bytes, from: {addr})")
                     elif successful_frames % 100 == 0:  # 100パケットごとにログ
                         logger.debug(f"UDPビデオパケット受信中... ({successful_frames} パケット)")
                     
-                    # 簡単なテスト画像を生成（実際のH.264デコードの代替）
-                    if successful_frames <= 5:  # 最初の数フレームのみテスト画像を生成
+                    if codec is not None:
+                        # パケットからNALユニットを組み立ててデコード（欠損による破損は次のキーフレームで回復）
+                        try:
+                            for packet in codec.parse(data):
+                                for decoded in codec.decode(packet):
+                                    self.latest_frame = decoded.to_ndarray(format='bgr24')
+                        except Exception as e:
+                            logger.debug("H.264デコードエラー: %s", e)
+                    # 簡単なテスト画像を生成（PyAVが無い場合のH.264デコードの代替）
+                    elif successful_frames <= 5:  # 最初の数フレームのみテスト画像を生成
                         test_frame = self._create_test_frame(f"UDP Frame {successful_frames}")
-                        with self.frame_lock:
-                            self.latest_frame = test_frame
+                        self.latest_frame = test_frame
                 else:
                     consecutive_failures += 1
                     if consecutive_failures >= max_failures:
@@ -1321,12 +1593,8 @@ class AsyncTelloController:
                         break
                     time.sleep(0.1)
                     
-            except socket.timeout:
-                consecutive_failures += 1
-                if consecutive_failures >= max_failures:
-                    logger.warning(f"UDPソケットタイムアウトが連続発生（{consecutive_failures}回）")
-                    break
-                time.sleep(0.1)
+            except BlockingIOError:
+                continue  # 読めるデータがなかった
             except Exception as e:
                 logger.error(f"シンプルUDPフレームキャプチャエラー: {e}")
                 consecutive_failures += 1
@@ -1335,6 +1603,11 @@ class AsyncTelloController:
                     break
                 time.sleep(0.1)
         
+        selector.close()
+        if self._udp_wakeup is wakeup:
+            self._udp_wakeup = None
+        for sock in wakeup:
+            sock.close()
         logger.info("シンプルUDPビデオフレームキャプチャスレッドが終了しました")
     
     def _create_test_frame(self, text: str):
@@ -1350,34 +1623,61 @@ class AsyncTelloController:
             import cv2
             cv2.putText(frame, text, (50, 240), cv2.FONT_HERSHEY_SIMPLEX, 2, (255, 255, 255), 3)
             cv2.putText(frame, "Tello Video Stream", (50, 300), cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
-            cv2.putText(frame, f"Time: {datetime.now().strftime('%H:%M:%S')}", (50, 350), cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
+            cv2.putText(frame, f"Time: {time.strftime('%H:%M:%S')}", (50, 350), cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
         except:
             pass  # OpenCVが利用できない場合はテキストなしで続行
         
         return frame
     
+    def _encode_frame(self, frame: np.ndarray, with_base64: bool = True) -> Tuple[bytes, str]:
+        """フレームを元の解像度のままJPEG（必要ならBase64も）に変換します（同じフレームならキャッシュを返す）
+        
+        画像解析に使われるため縮小しない。
+        Base64はJSONで返す場合にのみ必要なため、初めて要求された時点で生成する。
+        """
+        cached_frame, jpeg, frame_base64 = self._encoded_frame
+        if cached_frame is not frame:
+            jpeg = _encode_jpeg(frame)
+            frame_base64 = ""
+        if with_base64 and not frame_base64:
+            # Base64はASCIIのみなのでデコードはasciiで十分
+            frame_base64 = base64.b64encode(jpeg).decode('ascii')
+        self._encoded_frame = (frame, jpeg, frame_base64)
+        return jpeg, frame_base64
+    
+    def _encode_web_frame(self, frame: np.ndarray) -> bytes:
+        """フレームをWeb配信用に縮小してJPEGに変換します（同じフレームならキャッシュを返す）"""
+        cached_frame, jpeg = self._encoded_web_frame
+        if cached_frame is not frame:
+            jpeg = _encode_jpeg(_downscale_for_web(frame))
+            self._encoded_web_frame = (frame, jpeg)
+        return jpeg
+    
+    def get_latest_jpeg(self, for_web: bool = False) -> Tuple[Optional[np.ndarray], Optional[bytes]]:
+        """最新のビデオフレームとそのJPEGを取得します（ストリーミング停止中は(None, None)）
+        
+        for_webがTrueの場合はWeb配信用に縮小したJPEGを、それ以外は元の解像度のJPEGを返す。
+        """
+        frame = self.latest_frame
+        if not self.video_streaming or frame is None:
+            return None, None
+        if for_web:
+            return frame, self._encode_web_frame(frame)
+        return frame, self._encode_frame(frame, with_base64=False)[0]
+    
     async def get_video_frame(self) -> Dict[str, Any]:
         """最新のビデオフレームをBase64エンコードして取得します"""
-        if not self.video_streaming or self.latest_frame is None:
-            return {
-                "success": False,
-                "message": "ビデオストリーミングが開始されていません"
-            }
+        frame = self.latest_frame  # 参照を一度だけ取得（以後差し替えられても影響しない）
+        if not self.video_streaming or frame is None:
+            return _VIDEO_NOT_STARTED_RESULT
         
         try:
-            with self.frame_lock:
-                frame = self.latest_frame.copy()
-            
-            # フレームをJPEGエンコード（品質を下げて高速化）
-            _, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 60])
-            
-            # Base64エンコード
-            frame_base64 = base64.b64encode(buffer).decode('utf-8')
+            _, frame_base64 = self._encode_frame(frame)
             
             return {
                 "success": True,
                 "frame": frame_base64,
-                "timestamp": datetime.now().isoformat()
+                "timestamp": _now_iso()
             }
             
         except Exception as e:
@@ -1390,7 +1690,6 @@ class AsyncTelloController:
     async def disconnect(self):
         """Telloから切断します"""
         try:
-            self.running = False
             self.video_streaming = False
             
             # OpenCVキャプチャを停止
@@ -1410,23 +1709,21 @@ class AsyncTelloController:
                     self.ffmpeg_process = None
             
             # シンプルUDPソケットを停止
-            if self.udp_socket:
-                try:
-                    self.udp_socket.close()
-                except:
-                    pass
-                finally:
-                    self.udp_socket = None
+            self._close_udp_socket()
             
             self.use_ffmpeg = False
+            self.use_pyav = False
+            # PyAVスレッドがUDPポートを解放するまで待つ
+            await self._join_pyav_thread()
             self.use_simple_udp = False
             self.latest_frame = None
+            self._encoded_frame = (None, b"", "")
+            self._encoded_web_frame = (None, b"")
             
-            if self.receive_thread and self.receive_thread.is_alive():
-                self.receive_thread.join(timeout=2)
-            
-            if self.socket:
-                self.socket.close()
+            if self.transport:
+                self.transport.close()
+                self.transport = None
+            _classify_datagram.cache_clear()
                 
             self.is_connected = False
             self.flight_status = "landed"
@@ -1441,35 +1738,74 @@ class AsyncTelloController:
 # グローバルTelloコントローラーインスタンス
 tello_controller = AsyncTelloController()
 
+
+def _dumps(obj) -> bytes:
+    """JSONをUTF-8バイト列に変換します（orjsonがあれば使用）"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False).encode('utf-8')
+
+
+def _loads(data: bytes) -> Any:
+    """UTF-8のJSONバイト列を解析します（orjsonがあれば使用、デコード不要）"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# 固定レスポンスのシリアライズ済みボディ（モジュールが保持する辞書なのでidは再利用されない）
+_STATIC_BODIES = {
+    id(result): _dumps(result)
+    for result in (
+        _NOT_CONNECTED_RESULT,
+        _NOT_FLYING_RESULT,
+        _INVALID_DISTANCE_RESULT,
+        _INVALID_DEGREES_RESULT,
+        _VIDEO_NOT_STARTED_RESULT,
+        _DISCONNECTED_RESULT,
+    )
+}
+
+
+def _json_response(data: Any, status: int = 200, headers: Optional[Dict[str, str]] = None) -> web.Response:
+    """JSONレスポンスを作成します（web.json_responseの代替）"""
+    body = _STATIC_BODIES.get(id(data)) or _dumps(data)
+    return web.Response(body=body, status=status, headers=headers, content_type='application/json')
+
 # HTTP APIハンドラー
 async def _parse_request_params(request: web.Request, param_names: list) -> dict:
     """Parse parameters from JSON body or query string"""
-    logger.info(f"Content-Type: {request.content_type}")
-    logger.info(f"Headers: {dict(request.headers)}")
+    # リクエスト詳細はDEBUG時のみ出力（ヘッダーの辞書化も無効時は行わない）
+    debug = logger.isEnabledFor(logging.DEBUG)
+    if debug:
+        logger.debug("Content-Type: %s", request.content_type)
+        logger.debug("Headers: %s", dict(request.headers))
     
-    body_text = await request.text()
-    logger.info(f"Request body: '{body_text}'")
+    # ボディはバイト列のまま扱い、文字列へのデコードを省く
+    body = (await request.read()).strip()
+    if debug:
+        logger.debug("Request body: %r", body)
     
-    if body_text.strip() and (request.content_type == 'application/json' or body_text.strip().startswith('{')):
+    if body and (request.content_type == 'application/json' or body.startswith(b'{')):
         try:
-            data = json.loads(body_text)
+            data = _loads(body)
             params = {name: data.get(name) for name in param_names}
-            logger.info(f"JSON解析成功: {params}")
+            logger.debug("JSON解析成功: %s", params)
             return params
         except json.JSONDecodeError as e:
             logger.error(f"JSON解析エラー: {e}")
             raise web.HTTPBadRequest(
-                text=json.dumps({"success": False, "message": f"無効なJSON形式です: {str(e)}"}),
+                body=_dumps({"success": False, "message": f"無効なJSON形式です: {str(e)}"}),
                 content_type='application/json'
             )
     else:
         params = {name: request.query.get(name) for name in param_names}
-        logger.info(f"クエリパラメータ使用: {params}")
+        logger.debug("クエリパラメータ使用: %s", params)
         
         if any(params[name] is None for name in param_names):
             missing = [name for name in param_names if params[name] is None]
             raise web.HTTPBadRequest(
-                text=json.dumps({
+                body=_dumps({
                     "success": False, 
                     "message": f"必要なパラメータ（{', '.join(missing)}）が不足しています。"
                 }),
@@ -1481,42 +1817,42 @@ async def _parse_request_params(request: web.Request, param_names: list) -> dict
 async def connect_handler(request: web.Request) -> web.Response:
     """接続エンドポイント"""
     result = await tello_controller.connect()
-    return web.json_response(result)
+    return _json_response(result)
 
 async def disconnect_handler(request: web.Request) -> web.Response:
     """切断エンドポイント"""
     await tello_controller.disconnect()
-    return web.json_response({"success": True, "message": "切断しました"})
+    return _json_response(_DISCONNECTED_RESULT)
 
 async def status_handler(request: web.Request) -> web.Response:
     """状態取得エンドポイント"""
     result = await tello_controller.get_status()
-    return web.json_response(result)
+    return _json_response(result)
 
 async def battery_handler(request: web.Request) -> web.Response:
     """バッテリー残量取得エンドポイント"""
     result = await tello_controller.get_battery()
-    return web.json_response(result)
+    return _json_response(result)
 
 async def takeoff_handler(request: web.Request) -> web.Response:
     """離陸エンドポイント"""
     result = await tello_controller.takeoff()
-    return web.json_response(result)
+    return _json_response(result)
 
 async def land_handler(request: web.Request) -> web.Response:
     """着陸エンドポイント"""
     result = await tello_controller.land()
-    return web.json_response(result)
+    return _json_response(result)
 
 async def emergency_handler(request: web.Request) -> web.Response:
     """緊急停止エンドポイント"""
     result = await tello_controller.emergency()
-    return web.json_response(result)
+    return _json_response(result)
 
 async def reset_status_handler(request: web.Request) -> web.Response:
     """飛行状態リセットエンドポイント"""
     result = await tello_controller.reset_flight_status()
-    return web.json_response(result)
+    return _json_response(result)
 
 async def move_handler(request: web.Request) -> web.Response:
     """移動エンドポイント"""
@@ -1527,17 +1863,17 @@ async def move_handler(request: web.Request) -> web.Response:
         distance = int(params['distance'])
         
         result = await tello_controller.move(params['direction'], distance)
-        return web.json_response(result)
+        return _json_response(result)
         
     except web.HTTPBadRequest:
         raise
     except ValueError as e:
-        return web.json_response(
+        return _json_response(
             {"success": False, "message": f"distanceは数値で指定してください: {str(e)}"}, 
             status=400
         )
     except Exception as e:
-        return web.json_response(
+        return _json_response(
             {"success": False, "message": f"エラー: {e}"}, 
             status=500
         )
@@ -1551,17 +1887,17 @@ async def rotate_handler(request: web.Request) -> web.Response:
         degrees = int(params['degrees'])
         
         result = await tello_controller.rotate(params['direction'], degrees)
-        return web.json_response(result)
+        return _json_response(result)
         
     except web.HTTPBadRequest:
         raise
     except ValueError as e:
-        return web.json_response(
+        return _json_response(
             {"success": False, "message": f"degreesは数値で指定してください: {str(e)}"}, 
             status=400
         )
     except Exception as e:
-        return web.json_response(
+        return _json_response(
             {"success": False, "message": f"エラー: {e}"}, 
             status=500
         )
@@ -1569,23 +1905,67 @@ async def rotate_handler(request: web.Request) -> web.Response:
 async def start_video_handler(request: web.Request) -> web.Response:
     """ビデオストリーミング開始エンドポイント"""
     result = await tello_controller.start_video_stream()
-    return web.json_response(result)
+    return _json_response(result)
 
 async def stop_video_handler(request: web.Request) -> web.Response:
     """ビデオストリーミング停止エンドポイント"""
     result = await tello_controller.stop_video_stream()
-    return web.json_response(result)
+    return _json_response(result)
+
+# 映像レスポンスはブラウザにキャッシュさせない
+_NO_CACHE_HEADERS = {hdrs.CACHE_CONTROL: 'no-cache'}
 
 async def video_frame_handler(request: web.Request) -> web.Response:
-    """ビデオフレーム取得エンドポイント"""
+    """ビデオフレーム取得エンドポイント
+    
+    AcceptヘッダーでJPEG（image/jpegまたはapplication/octet-stream）を受け付けるクライアントには、
+    Base64を介さずJPEGのバイト列をそのまま返す。
+    """
+    accept = request.headers.get(hdrs.ACCEPT, '')
+    if 'image/jpeg' in accept or 'application/octet-stream' in accept:
+        frame, jpeg = tello_controller.get_latest_jpeg()
+        if frame is None:
+            return _json_response(_VIDEO_NOT_STARTED_RESULT)
+        return web.Response(body=jpeg, content_type='image/jpeg', headers=_NO_CACHE_HEADERS)
+    
     result = await tello_controller.get_video_frame()
-    return web.json_response(result)
+    return _json_response(result)
+
+async def video_stream_handler(request: web.Request) -> web.StreamResponse:
+    """MJPEGビデオストリーミングエンドポイント（Base64やポーリングを使わずJPEGをそのまま送信）"""
+    frame, jpeg = tello_controller.get_latest_jpeg(for_web=True)
+    if frame is None:
+        return _json_response(_VIDEO_NOT_STARTED_RESULT)
+    
+    response = web.StreamResponse(headers={
+        **_CORS_HEADERS,
+        **_NO_CACHE_HEADERS,
+        'Content-Type': 'multipart/x-mixed-replace; boundary=frame',
+    })
+    await response.prepare(request)
+    
+    last_frame = None
+    try:
+        while frame is not None:
+            # 新しいフレームが届いたときだけ送信
+            if frame is not last_frame:
+                await response.write(
+                    b'--frame\r\nContent-Type: image/jpeg\r\nContent-Length: %d\r\n\r\n' % len(jpeg)
+                    + jpeg + b'\r\n'
+                )
+                last_frame = frame
+            await asyncio.sleep(MJPEG_POLL_INTERVAL)
+            frame, jpeg = tello_controller.get_latest_jpeg(for_web=True)
+    except ConnectionResetError:
+        logger.debug("MJPEGストリームのクライアントが切断しました")
+    return response
 
 async def video_debug_handler(request: web.Request) -> web.Response:
     """ビデオストリーミングデバッグ情報エンドポイント"""
     debug_info = {
         "video_streaming": tello_controller.video_streaming,
         "use_ffmpeg": tello_controller.use_ffmpeg,
+        "use_pyav": tello_controller.use_pyav,
         "use_simple_udp": tello_controller.use_simple_udp,
         "cap_opened": tello_controller.cap.isOpened() if tello_controller.cap else False,
         "ffmpeg_process_running": tello_controller.ffmpeg_process is not None and tello_controller.ffmpeg_process.poll() is None if tello_controller.ffmpeg_process else False,
@@ -1594,13 +1974,13 @@ async def video_debug_handler(request: web.Request) -> web.Response:
         "latest_frame_shape": tello_controller.latest_frame.shape if tello_controller.latest_frame is not None else None,
         "is_connected": tello_controller.is_connected
     }
-    return web.json_response({"success": True, "debug_info": debug_info})
+    return _json_response({"success": True, "debug_info": debug_info})
 
 async def copilotkit_handler(request: web.Request) -> web.Response:
     """AG-UI/CopilotKit APIエンドポイント - Mastraエージェントとの通信"""
     try:
-        # リクエストボディを取得
-        body = await request.json()
+        # リクエストボディを取得（orjsonがあればそれで解析）
+        body = _loads(await request.read())
         messages = body.get('messages', [])
         thread_id = body.get('threadId', 'default')
         resource_id = body.get('resourceId', 'user')
@@ -1617,19 +1997,19 @@ async def copilotkit_handler(request: web.Request) -> web.Response:
             response_text = await call_mastra_agent(last_message, thread_id, resource_id)
         
         # 成功レスポンスを返す
-        return web.json_response({
+        return _json_response({
             "success": True,
             "text": response_text,
             "toolCalls": {},
-            "timestamp": datetime.now().isoformat()
+            "timestamp": _now_iso()
         })
         
     except Exception as e:
         logger.error(f"CopilotKit API error: {e}")
-        return web.json_response({
+        return _json_response({
             "success": False,
             "error": str(e),
-            "timestamp": datetime.now().isoformat()
+            "timestamp": _now_iso()
         }, status=500)
 
 async def call_mastra_agent(message: str, thread_id: str, resource_id: str) -> str:
@@ -1676,115 +2056,101 @@ async def call_mastra_agent(message: str, thread_id: str, resource_id: str) -> s
                     
 
 
+_HEALTH_STATUS = {
+    "status": "healthy",
+    "service": "Tello Web Controller",
+}
+# タイムスタンプとシリアライズ済みボディの組（タイムスタンプが変わる1秒ごとに再生成）
+_health_body_cache = ('', b'')
+
 async def health_handler(request: web.Request) -> web.Response:
     """ヘルスチェックエンドポイント"""
-    return web.json_response({
-        "status": "healthy",
-        "service": "Tello Web Controller",
-        "timestamp": datetime.now().isoformat()
-    })
+    global _health_body_cache
+    timestamp = _now_iso()
+    if _health_body_cache[0] != timestamp:
+        _health_body_cache = (timestamp, _dumps({**_HEALTH_STATUS, "timestamp": timestamp}))
+    return web.Response(body=_health_body_cache[1], content_type='application/json')
 
-# CORS対応
-async def cors_handler(request: web.Request) -> web.Response:
-    """CORS preflight対応"""
-    return web.Response(
-        headers={
-            'Access-Control-Allow-Origin': 'http://localhost:3000',  # 開発環境用、本番では適切なドメインを設定
-            'Access-Control-Allow-Methods': 'GET, POST, OPTIONS',
-            'Access-Control-Allow-Headers': 'Content-Type',
-        }
-    )
+# CORS対応（開発環境用、本番では適切なドメインを設定）
+# キーはaiohttpのistr定数を使い、ヘッダー追加のたびに大文字小文字を正規化しないようにする
+_CORS_HEADERS = CIMultiDict({
+    hdrs.ACCESS_CONTROL_ALLOW_ORIGIN: 'http://localhost:3000',
+    hdrs.ACCESS_CONTROL_ALLOW_METHODS: 'GET, POST, OPTIONS',
+    hdrs.ACCESS_CONTROL_ALLOW_HEADERS: 'Content-Type, Authorization',
+})
+# preflightの結果をブラウザに24時間キャッシュさせ、POSTごとのOPTIONSを省く
+_CORS_PREFLIGHT_HEADERS = CIMultiDict(_CORS_HEADERS)
+_CORS_PREFLIGHT_HEADERS[hdrs.ACCESS_CONTROL_MAX_AGE] = '86400'
 
 def setup_cors(app):
-    """CORS設定"""
+    """CORS設定（例外のJSON変換も同じミドルウェアで行い、ミドルウェアを1段に保つ）"""
     @web.middleware
     async def cors_middleware(request, handler):
-        # OPTIONSリクエストの場合は直接レスポンスを返す
+        # OPTIONSリクエスト（preflight）はルーティング結果に関係なく直接レスポンスを返す
         if request.method == 'OPTIONS':
-            return web.Response(
-                headers={
-                    'Access-Control-Allow-Origin': 'http://localhost:3000',  # 開発環境用、本番では適切なドメインを設定
-                    'Access-Control-Allow-Methods': 'GET, POST, OPTIONS',
-                    'Access-Control-Allow-Headers': 'Content-Type, Authorization',
-                }
-            )
+            return web.Response(status=204, headers=_CORS_PREFLIGHT_HEADERS)
         
         try:
             response = await handler(request)
-            response.headers['Access-Control-Allow-Origin'] = 'http://localhost:3000'  # 開発環境用、本番では適切なドメインを設定
-            response.headers['Access-Control-Allow-Methods'] = 'GET, POST, OPTIONS'
-            response.headers['Access-Control-Allow-Headers'] = 'Content-Type, Authorization'
-            return response
-        except web.HTTPMethodNotAllowed as e:
+        except web.HTTPMethodNotAllowed:
             logger.error(f"Method not allowed: {request.method} {request.path}")
-            return web.json_response({
+            return _json_response({
                 "error": f"Method {request.method} not allowed for {request.path}",
                 "allowed_methods": ["GET", "POST", "OPTIONS"]
-            }, status=405, headers={
-            'Access-Control-Allow-Origin': 'http://localhost:3000',  # 開発環境用、本番では適切なドメインを設定
-                'Access-Control-Allow-Methods': 'GET, POST, OPTIONS',
-                'Access-Control-Allow-Headers': 'Content-Type, Authorization'
-            })
+            }, status=405, headers=_CORS_HEADERS)
+        except web.HTTPException as e:
+            # 400（パラメータ不正）や404などは意図したステータスのままCORSヘッダーを付けて返す
+            e.headers.update(_CORS_HEADERS)
+            raise
         except Exception as e:
-            logger.error(f"CORS middleware error: {e}")
-            return web.json_response({
+            logger.error(f"Request handling error: {e}")
+            return _json_response({
                 "error": str(e),
                 "path": request.path,
                 "method": request.method
-            }, status=500, headers={
-            'Access-Control-Allow-Origin': 'http://localhost:3000',  # 開発環境用、本番では適切なドメインを設定
-                'Access-Control-Allow-Methods': 'GET, POST, OPTIONS',
-                'Access-Control-Allow-Headers': 'Content-Type, Authorization'
-            })
+            }, status=500, headers=_CORS_HEADERS)
+        response.headers.update(_CORS_HEADERS)
+        return response
     
     app.middlewares.append(cors_middleware)
 
+# ルート定義（固定パスはaiohttpのルーターがパスをキーに直接引くため、件数が増えても解決は線形探索にならない）
+_ROUTES = [
+    web.get('/health', health_handler),
+    web.post('/api/connect', connect_handler),
+    web.post('/api/disconnect', disconnect_handler),
+    web.get('/api/status', status_handler),
+    web.get('/api/battery', battery_handler),
+    web.post('/api/takeoff', takeoff_handler),
+    web.post('/api/land', land_handler),
+    web.post('/api/emergency', emergency_handler),
+    web.post('/api/reset_status', reset_status_handler),
+    web.post('/api/move', move_handler),
+    web.post('/api/rotate', rotate_handler),
+    web.post('/api/video/start', start_video_handler),
+    web.post('/api/video/stop', stop_video_handler),
+    web.get('/api/video/frame', video_frame_handler),
+    web.get('/api/video/stream', video_stream_handler),
+    web.get('/api/video/debug', video_debug_handler),
+    # AG-UI/CopilotKit API
+    web.post('/api/copilotkit', copilotkit_handler),
+]
+
 def create_app() -> web.Application:
     """Webアプリケーションを作成します"""
     app = web.Application()
     
-    # ルート設定（/api/ プレフィックス付き）
-    app.router.add_get('/health', health_handler)
-    app.router.add_post('/api/connect', connect_handler)
-    app.router.add_post('/api/disconnect', disconnect_handler)
-    app.router.add_get('/api/status', status_handler)
-    app.router.add_get('/api/battery', battery_handler)
-    app.router.add_post('/api/takeoff', takeoff_handler)
-    app.router.add_post('/api/land', land_handler)
-    app.router.add_post('/api/emergency', emergency_handler)
-    app.router.add_post('/api/reset_status', reset_status_handler)
-    app.router.add_post('/api/move', move_handler)
-    app.router.add_post('/api/rotate', rotate_handler)
-    app.router.add_post('/api/video/start', start_video_handler)
-    app.router.add_post('/api/video/stop', stop_video_handler)
-    app.router.add_get('/api/video/frame', video_frame_handler)
-    app.router.add_get('/api/video/debug', video_debug_handler)
-    
-    # AG-UI/CopilotKit API
-    app.router.add_post('/api/copilotkit', copilotkit_handler)
-    app.router.add_options('/api/copilotkit', cors_handler)
+    # ルート設定（/api/ プレフィックス付き、変数を含まない固定パスのみ）
+    app.router.add_routes(_ROUTES)
     
-    # OPTIONS用のルート設定（/api/ プレフィックス付き）
-    app.router.add_options('/api/connect', cors_handler)
-    app.router.add_options('/api/disconnect', cors_handler)
-    app.router.add_options('/api/status', cors_handler)
-    app.router.add_options('/api/battery', cors_handler)
-    app.router.add_options('/api/takeoff', cors_handler)
-    app.router.add_options('/api/land', cors_handler)
-    app.router.add_options('/api/emergency', cors_handler)
-    app.router.add_options('/api/reset_status', cors_handler)
-    app.router.add_options('/api/move', cors_handler)
-    app.router.add_options('/api/rotate', cors_handler)
-    app.router.add_options('/api/video/start', cors_handler)
-    app.router.add_options('/api/video/stop', cors_handler)
-    app.router.add_options('/api/video/frame', cors_handler)
+    # CORS設定（OPTIONSリクエストはミドルウェアで応答）
+    setup_cors(app)
     
     return app
 
 async def main():
     """メイン関数"""
     app = create_app()
-    setup_cors(app)  # CORS設定を追加
     
     # サーバー設定
     host = '0.0.0.0'
@@ -1796,7 +2162,8 @@ async def main():
     logger.info("AG-UI/CopilotKit APIエンドポイント: /api/copilotkit")
     
     # サーバー起動
-    runner = web.AppRunner(app)
+    # HTTPアクセスログを無効化（ロガーで捨てるのではなく、記録の生成自体を行わない）
+    runner = web.AppRunner(app, access_log=None)
     await runner.setup()
     site = web.TCPSite(runner, host, port)
     await site.start()
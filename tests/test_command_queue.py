@@ -0,0 +1,43 @@
+"""コマンドの同時実行数上限（_send_command）のテスト"""
+import asyncio
+
+from tello_web_server import AsyncTelloController, MAX_QUEUED_COMMANDS, _UNSHEDDABLE_COMMANDS
+
+
+class _QueueingController(AsyncTelloController):
+    """送信せずに呼び出し順だけを記録するコントローラー（release()まで応答しない）"""
+
+    def __init__(self):
+        super().__init__()
+        self.sent = []
+        self.release = asyncio.Event()
+
+    async def _send_command_locked(self, command, timeout, retry_on_timeout, deadline):
+        self.sent.append(command)
+        await self.release.wait()
+        return "ok"
+
+
+async def _fill_queue_then_send(command):
+    controller = _QueueingController()
+    pending = [asyncio.ensure_future(controller._send_command('forward 20')) for _ in range(MAX_QUEUED_COMMANDS)]
+    await asyncio.sleep(0)
+    response_task = asyncio.ensure_future(controller._send_command(command))
+    await asyncio.sleep(0)
+    controller.release.set()
+    response = await response_task
+    await asyncio.gather(*pending)
+    return response, controller.sent
+
+
+def test_ordinary_command_is_shed_when_queue_is_full():
+    response, sent = asyncio.run(_fill_queue_then_send('up 20'))
+    assert response == "busy"
+    assert 'up 20' not in sent
+
+
+def test_safety_commands_are_never_shed():
+    for command in _UNSHEDDABLE_COMMANDS:
+        response, sent = asyncio.run(_fill_queue_then_send(command))
+        assert response == "ok"
+        assert sent[-1] == command
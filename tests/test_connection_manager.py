@@ -0,0 +1,81 @@
+"""CLI用接続マネージャー（TelloConnectionManager.execute_command）のテスト"""
+import json
+import socket
+import threading
+
+import pytest
+
+import tello_connection_manager
+from tello_connection_manager import TelloConnectionManager
+
+
+class _UnreachableController:
+    """前回のコマンドがタイムアウトし、commandの再送にも応答しないTelloの代わり"""
+
+    def __init__(self):
+        self.is_connected = True
+        self.needs_handshake = True
+        self.last_battery = 50
+        self.sent = []
+
+    def connect(self):
+        self.sent.append('command')
+        return False
+
+    def land(self):
+        self.sent.append('land')
+        return True
+
+    def emergency(self):
+        self.sent.append('emergency')
+        return True
+
+    def move_up(self, distance):
+        self.sent.append(f'up {distance}')
+        return True
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    # テストプロセスのシグナルハンドラーとatexitは書き換えない
+    monkeypatch.setattr(TelloConnectionManager, '_setup_signal_handlers', lambda self: None)
+    manager = TelloConnectionManager()
+    controller = _UnreachableController()
+    monkeypatch.setattr(manager, '_tello_controller', controller)
+    return manager, controller
+
+
+def test_safety_commands_are_sent_even_if_handshake_fails(manager):
+    manager, controller = manager
+    assert manager.execute_command('land')["success"] is True
+    assert manager.execute_command('emergency')["success"] is True
+    assert controller.sent == ['command', 'land', 'command', 'emergency']
+
+
+def test_other_commands_wait_for_handshake(manager):
+    manager, controller = manager
+    result = manager.execute_command('up', distance=50)
+    assert result["success"] is False
+    assert controller.sent == ['command']
+
+
+@pytest.mark.skipif(not tello_connection_manager.DAEMON_USE_UNIX_SOCKET, reason="AF_UNIXが使えない環境")
+def test_daemon_closing_without_reply_is_reported_as_failure(tmp_path, monkeypatch):
+    path = str(tmp_path / 'daemon.sock')
+    monkeypatch.setattr(tello_connection_manager, 'DAEMON_SOCKET_PATH', path)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(path)
+    server.listen(1)
+
+    def close_without_reply():
+        conn, _ = server.accept()
+        conn.makefile('rb').readline()
+        conn.close()
+    thread = threading.Thread(target=close_without_reply)
+    thread.start()
+    try:
+        response = tello_connection_manager.request_daemon({"action": "status"})
+    finally:
+        thread.join()
+        server.close()
+    assert json.loads(response)["success"] is False
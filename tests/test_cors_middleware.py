@@ -0,0 +1,49 @@
+"""CORSミドルウェア（例外のJSON変換を含む）のテスト"""
+import asyncio
+
+from aiohttp import hdrs, web
+from aiohttp.test_utils import TestClient, TestServer
+
+from tello_web_server import create_app
+
+ORIGIN = 'http://localhost:3000'
+
+
+async def _failing_handler(request):
+    raise RuntimeError("boom")
+
+
+async def _request(method, path):
+    app = create_app()
+    app.router.add_get('/test/error', _failing_handler)
+    async with TestClient(TestServer(app)) as client:
+        response = await client.request(method, path)
+        body = await response.read()
+        return response.status, response.headers, body
+
+
+def test_preflight_is_answered_with_max_age():
+    status, headers, _ = asyncio.run(_request('OPTIONS', '/api/move'))
+    assert status == 204
+    assert headers[hdrs.ACCESS_CONTROL_ALLOW_ORIGIN] == ORIGIN
+    assert headers[hdrs.ACCESS_CONTROL_MAX_AGE] == '86400'
+
+
+def test_not_found_keeps_status_and_cors_headers():
+    status, headers, _ = asyncio.run(_request('GET', '/api/unknown'))
+    assert status == 404
+    assert headers[hdrs.ACCESS_CONTROL_ALLOW_ORIGIN] == ORIGIN
+
+
+def test_method_not_allowed_is_translated_with_cors_headers():
+    status, headers, body = asyncio.run(_request('GET', '/api/move'))
+    assert status == 405
+    assert headers[hdrs.ACCESS_CONTROL_ALLOW_ORIGIN] == ORIGIN
+    assert b'allowed_methods' in body
+
+
+def test_unhandled_error_is_translated_with_cors_headers():
+    status, headers, body = asyncio.run(_request('GET', '/test/error'))
+    assert status == 500
+    assert headers[hdrs.ACCESS_CONTROL_ALLOW_ORIGIN] == ORIGIN
+    assert b'boom' in body
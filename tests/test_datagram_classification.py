@@ -0,0 +1,29 @@
+"""受信データグラムの判定（_handle_datagram）のテスト"""
+import asyncio
+
+from tello_web_server import AsyncTelloController
+
+
+def _receive(datagram):
+    """応答待ちの状態でデータグラムを受信させ、コマンドに渡された応答を返します（破棄された場合はNone）"""
+    async def run():
+        controller = AsyncTelloController()
+        awaiting = controller._awaiting = asyncio.get_running_loop().create_future()
+        controller._handle_datagram(datagram)
+        return awaiting.result() if awaiting.done() else None
+    return asyncio.run(run())
+
+
+def test_numeric_reply_with_crlf_is_delivered():
+    # battery? などの応答は末尾にCRLFが付く（短い応答でも改行を非印刷文字と数えない）
+    assert _receive(b"87\r\n") == "87"
+
+
+def test_known_reply_is_delivered():
+    assert _receive(b"ok") == "ok"
+    assert _receive(b"error Not joystick\r\n") == "error Not joystick"
+
+
+def test_binary_data_is_dropped():
+    assert _receive(bytes(range(16))) is None
+    assert _receive(b"\x00\x00\x00\x01\x67\x4d\x40\x28") is None
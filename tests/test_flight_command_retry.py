@@ -0,0 +1,70 @@
+"""移動・回転コマンドのタイムアウト→再接続→再試行（_execute_flight_command）のテスト"""
+import asyncio
+
+import pytest
+
+import tello_web_server
+from tello_web_server import AsyncTelloController
+
+
+class _FakeTello(asyncio.DatagramProtocol):
+    """最初の移動コマンドには応答せず、再試行には遅れて応答するTelloの代わり"""
+
+    def __init__(self, retry_delay):
+        self.retry_delay = retry_delay
+        self.commands = []
+        self.transport = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        command = data.decode('ascii')
+        self.commands.append(command)
+        if command == 'battery?':
+            self.transport.sendto(b'80\r\n', addr)
+        elif self.commands.count(command) > 1:
+            asyncio.get_running_loop().call_later(self.retry_delay, self.transport.sendto, b'ok', addr)
+
+
+@pytest.fixture
+def short_timeouts(monkeypatch):
+    # 実際の値（10秒・25秒）と同じ比率で短縮する
+    monkeypatch.setattr(tello_web_server, 'FLIGHT_COMMAND_TIMEOUT', 0.2)
+    monkeypatch.setattr(tello_web_server, 'FLIGHT_COMMAND_DEADLINE', 0.5)
+    monkeypatch.setattr(tello_web_server, 'RETRY_BACKOFF_BASE', 0.01)
+
+
+async def _move_forward(retry_delay):
+    loop = asyncio.get_running_loop()
+    fake_transport, fake = await loop.create_datagram_endpoint(
+        lambda: _FakeTello(retry_delay), local_addr=('127.0.0.1', 0))
+    controller = AsyncTelloController()
+    controller.tello_ip, controller.tello_port = fake_transport.get_extra_info('sockname')
+    controller.local_ip, controller.local_port = '127.0.0.1', 0
+    controller.loop = loop
+    controller.transport = await controller._open_transport()
+    controller.is_connected = True
+    controller.flight_status = "flying"
+    try:
+        result = await controller.move('forward', 50)
+    finally:
+        controller.transport.close()
+        fake_transport.close()
+    return result, fake.commands
+
+
+def test_retry_after_reconnect_gets_a_full_command_timeout(short_timeouts):
+    # 再試行の応答が1回分の待ち時間ぎりぎりに届いても成功する
+    result, commands = asyncio.run(_move_forward(retry_delay=0.15))
+    assert result["success"] is True
+    assert result["reconnected"] is True
+    assert commands == ['forward 50', 'battery?', 'forward 50']
+
+
+def test_retry_is_skipped_when_deadline_cannot_cover_it(short_timeouts, monkeypatch):
+    monkeypatch.setattr(tello_web_server, 'FLIGHT_COMMAND_DEADLINE', 0.3)
+    result, commands = asyncio.run(_move_forward(retry_delay=0.0))
+    assert result["success"] is False
+    assert result["reconnected"] is True
+    assert commands == ['forward 50', 'battery?']